@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    만료시간이 있는 LRU 캐시입니다.
+    maxsize를 넘으면 가장 오래 쓰이지 않은 항목부터 버리고, 만료된 항목은 get에서 지웁니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            found = self._data.get(key)
+            if found is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = found
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """ ttl이 주어지면 기본 ttl보다 짧은 쪽을 씁니다. """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return dict(
+                size=len(self._data),
+                hits=self.hits,
+                misses=self.misses,
+                hit_ratio=(self.hits / total) if total else 0.0,
+            )
+
+
+# 토큰의 subject(User.name) -> User
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+# JWT 문자열 -> Payload (토큰 만료시각까지, 최대 1시간 보관)
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=60 * 60)
+
+# (user_id, 단어장 버전) -> UserWeights (적응형 출제용 가중치)
+weights_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.ADAPTIVE_WEIGHTS_TTL_SECONDS)
@@ -56,6 +56,16 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
 
+    # 커넥션 풀 (sync, async 엔진에 각각 적용됨)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    # 초 단위, -1이면 재활용하지 않음
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # 0이면 제한 없음
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -119,9 +129,74 @@ class Settings(BaseSettings):
         return self
     
     PEPPER: str
+    # argon2 비용 (기존 해시는 해시에 기록된 값으로 검증되므로 바꿔도 로그인에 문제 없음)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # 해싱 전용 스레드 수, 실행중 + 대기중 최대 개수, 자리가 날때까지 기다리는 시간(초)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_WAIT_SECONDS: float = 5
     JWT_ALGORITHM: str
     JWT_SECRET_KEY: str
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # 인증된 유저 조회 캐시 (개수, 초)와 JWT 디코딩 캐시 (개수)
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # 문제지/결과 라우터의 빠른 응답 경로 (재검증 생략 + 큰 응답 압축)
+    FAST_RESPONSES: bool = True
+    FAST_RESPONSE_COMPRESS_MIN_BYTES: int = 1024
+
+    # 단어장 캐시가 DB 체크섬을 다시 확인하는 주기(초)
+    VOCAB_CACHE_CHECK_SECONDS: int = 30
+    # memory -> 단어장 캐시에서 추출, database -> 큰 단어장일 때 DB에서 k개만 추출
+    PROBLEM_SAMPLING_MODE: Literal["memory", "database"] = "memory"
+
+    # 문제지 한장의 문제 수와 문제당 보기 수 (/papers/paper 에서 범위 안으로 바꿀 수 있음)
+    PAPER_PROBLEMS_DEFAULT: int = 20
+    PAPER_PROBLEMS_MAX: int = 500
+    PAPER_CANDIDATES_DEFAULT: int = 4
+    PAPER_CANDIDATES_MAX: int = 6
+
+    # 미리 만들어두는 문제지 풀 (남은 개수가 LOW 아래로 내려가면 HIGH까지 채움). 기본 크기의 문제지만 담음
+    PAPER_POOL_ENABLED: bool = True
+    PAPER_POOL_LOW_WATERMARK: int = 100
+    PAPER_POOL_HIGH_WATERMARK: int = 400
+
+    # 채점할때 난이도별 가중치 (점수 = 맞은 문제 가중치 합 / 전체 가중치 합 * 100)
+    # 이미 저장된 점수는 바뀌지 않으므로 바꾼 뒤에는 python -m app.data.rescore 로 다시 채점
+    DIFFICULTY_WEIGHT_EASY: float = 1
+    DIFFICULTY_WEIGHT_MODERATE: float = 2
+    DIFFICULTY_WEIGHT_HARD: float = 3
+
+    # 한번에 제출할 수 있는 문제지 수 (/papers/submit/batch)
+    SUBMIT_BATCH_MAX: int = 200
+
+    # 결과 내보내기에서 서버 커서로 한번에 읽어서 보내는 행 수
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # 제출시 단어별 통계를 모아서 저장하는 주기(초)와, 이보다 많이 모이면 바로 저장하는 개수
+    WORD_STATS_ENABLED: bool = True
+    WORD_STATS_FLUSH_SECONDS: int = 5
+    WORD_STATS_MAX_PENDING: int = 10000
+
+    # 유저 기록(usertextstat)으로 정답 단어를 고르는 적응형 출제
+    # MIN_HISTORY개 이상의 단어를 풀어본 유저에게만 적용하고, 가중치는 WEIGHTS_TTL초 동안 캐시함
+    # 가중치 = 1(모든 단어) + BOOST * 오답률 * (1 - exp(-지난 일수 / (HALF_LIFE_DAYS * (1 + 맞춘 횟수))))
+    # 적용되는 유저는 문제지 풀을 쓰지 못하므로 기본은 끔. 단어장 전체가 필요해서 MEMORY 모드에서만 동작함
+    ADAPTIVE_ENABLED: bool = False
+    ADAPTIVE_MIN_HISTORY: int = 50
+    ADAPTIVE_WEIGHTS_TTL_SECONDS: int = 300
+    ADAPTIVE_BOOST: float = 20.0
+    ADAPTIVE_HALF_LIFE_DAYS: float = 1.0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def adaptive_enabled(self) -> bool:
+        return self.ADAPTIVE_ENABLED and self.PROBLEM_SAMPLING_MODE == "memory"
+
 
 settings = Settings() # type: ignore
\ No newline at end of file
@@ -0,0 +1,27 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """ keyset 페이지네이션의 마지막 행 값들을 불투명한 문자열로 만듭니다. """
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else str(v) for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """ encode_cursor의 역함수입니다. 형식이 맞지 않으면 ValueError를 냅니다. """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("잘못된 cursor 입니다.")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("잘못된 cursor 입니다.")
+
+    return [str(v) for v in values]
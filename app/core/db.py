@@ -1,5 +1,101 @@
+import threading
+import time
+
 from sqlmodel import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
\ No newline at end of file
+
+class PoolMetrics:
+    """ 커넥션을 얻기까지 기다린 시간과 타임아웃 횟수를 모읍니다. """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.checkouts += 1
+            else:
+                self.timeouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self, pool: QueuePool) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return dict(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+                checkouts=self.checkouts,
+                timeouts=self.timeouts,
+                wait_avg_ms=(self.wait_total / attempts * 1000) if attempts else 0.0,
+                wait_max_ms=self.wait_max * 1000,
+            )
+
+
+class _MeteredPool:
+    """ QueuePool._do_get 을 감싸서 커넥션 대기시간을 기록합니다. """
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get() # type: ignore
+        except Exception:
+            self.metrics.record(time.perf_counter() - start, ok=False)
+            raise
+        self.metrics.record(time.perf_counter() - start, ok=True)
+        return conn
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    metrics = PoolMetrics()
+
+
+class MeteredAsyncQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def _engine_options() -> dict:
+    options = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=MeteredQueuePool,
+    **_engine_options(),
+)
+
+# 라우터용 (psycopg3의 async 드라이버를 그대로 사용)
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=MeteredAsyncQueuePool,
+    **_engine_options(),
+)
+
+
+def pool_metrics() -> dict:
+    return {
+        "sync": MeteredQueuePool.metrics.snapshot(engine.pool), # type: ignore
+        "async": MeteredAsyncQueuePool.metrics.snapshot(async_engine.sync_engine.pool), # type: ignore
+    }
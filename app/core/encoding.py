@@ -0,0 +1,38 @@
+from typing import Dict, Optional, Sequence
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """ Accept-Encoding 헤더를 coding -> q 값으로 나눕니다. (q가 없으면 1, 잘못된 q는 0) """
+    accepted: Dict[str, float] = {}
+    for token in value.split(","):
+        coding, *params = [part.strip() for part in token.split(";")]
+        if not coding:
+            continue
+
+        q = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """
+    available 중 q 값이 가장 높은(0보다 큰) 인코딩. 같으면 available 순서가 앞선 것.
+    헤더에 없는 인코딩은 * 의 q 값을 따릅니다. 고를게 없으면 None (압축하지 않음)
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    default = accepted.get("*", 0.0)
+
+    chosen, best = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, default)
+        if q > best:
+            chosen, best = encoding, q
+    return chosen
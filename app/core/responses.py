@@ -0,0 +1,53 @@
+import gzip
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.encoding import choose_encoding
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # brotli는 선택 의존성
+    brotli = None
+
+# 같은 q 값이면 앞의 것을 고름
+AVAILABLE = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def _compress(body: bytes, accept_encoding: str) -> tuple[bytes, str | None]:
+    if len(body) < settings.FAST_RESPONSE_COMPRESS_MIN_BYTES:
+        return body, None
+
+    encoding = choose_encoding(accept_encoding, AVAILABLE)
+    if encoding == "br":
+        return brotli.compress(body, quality=4), "br"
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
+
+
+def fast_response(request: Request, model: BaseModel, status_code: int = 200) -> Any:
+    """
+    서버가 방금 만든 응답 모델을 response_model 재검증 없이 pydantic-core로 바로 직렬화합니다.
+    FAST_RESPONSE_COMPRESS_MIN_BYTES 보다 크면 Accept-Encoding에 맞춰 br/gzip으로 압축합니다.
+    FAST_RESPONSES가 꺼져있으면 모델을 그대로 리턴해서 FastAPI의 기본 경로를 탑니다.
+    """
+    if not settings.FAST_RESPONSES:
+        return model
+
+    body = model.model_dump_json().encode()
+    body, encoding = _compress(body, request.headers.get("accept-encoding", ""))
+
+    headers = {"vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["content-encoding"] = encoding
+
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from argon2 import PasswordHasher
+
+from app.core.config import settings
+
+encoder = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+
+class HashingBusy(Exception):
+    """ 해싱 대기열이 가득 차서 wait_seconds 안에 자리가 나지 않았음 """
+
+
+class PasswordWorker:
+    """
+    argon2 해싱/검증을 크기가 정해진 스레드풀에서 실행합니다. (argon2-cffi는 GIL을 놓고 계산함)
+    실행중 + 대기중인 작업이 max_pending을 넘으면 wait_seconds 만큼 기다린 뒤 HashingBusy를 냅니다.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.PASSWORD_HASH_WORKERS,
+        max_pending: int = settings.PASSWORD_HASH_MAX_PENDING,
+        wait_seconds: float = settings.PASSWORD_HASH_WAIT_SECONDS,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.wait_seconds = wait_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="argon2")
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.wait_seconds) # type: ignore
+        except asyncio.TimeoutError:
+            raise HashingBusy()
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._slots.release() # type: ignore
+
+    async def hash(self, password: str) -> str:
+        return await self._run(encoder.hash, password + settings.PEPPER)
+
+    async def verify(self, hashed: str, password: str) -> bool:
+        return await self._run(_verify, hashed, password + settings.PEPPER)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+
+def _verify(hashed: str, peppered: str) -> bool:
+    try:
+        return encoder.verify(hashed, peppered)
+    except Exception:
+        return False
+
+
+password_worker = PasswordWorker()
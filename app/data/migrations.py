@@ -0,0 +1,234 @@
+"""
+이미 만들어진 테이블에 대한 스키마 변경 및 데이터 백필입니다.
+
+    python -m app.data.migrations
+
+새 테이블은 SQLModel.metadata.create_all 로 만들고, 기존 테이블은 아래 MIGRATIONS를
+순서대로 적용합니다. 모든 migration은 여러번 실행해도 안전해야 합니다.
+"""
+import json
+
+from sqlmodel import SQLModel, Session, text
+
+from app.core.db import engine
+from app.factory.codec import PaperView, decode_paper, encode_paper
+from app.factory.vocabulary import vocabulary
+from app.schemas.stats import add_counters
+
+BATCH_SIZE = 10_000
+
+
+def _in_batches(s: Session, statement: str) -> int:
+    """ ctid LIMIT으로 잘라서 적용하고 배치마다 커밋합니다. (긴 락 방지) """
+    total = 0
+    while True:
+        updated = s.exec(text(statement).bindparams(batch=BATCH_SIZE)).rowcount # type: ignore
+        s.commit()
+        total += updated
+        if updated == 0:
+            return total
+
+
+def paper_store_namespace_columns(s: Session) -> None:
+    """ PaperStore.prefix 를 user_id, paper_id 컬럼으로 나누고 인덱스를 만듭니다. """
+    s.exec(text("ALTER TABLE paperstore ADD COLUMN IF NOT EXISTS user_id UUID")) # type: ignore
+    s.exec(text("ALTER TABLE paperstore ADD COLUMN IF NOT EXISTS paper_id UUID")) # type: ignore
+    s.commit()
+
+    updated = _in_batches(s, """
+        UPDATE paperstore
+        SET user_id = split_part(prefix, '.', 1)::uuid,
+            paper_id = split_part(prefix, '.', 2)::uuid
+        WHERE ctid IN (
+            SELECT ctid FROM paperstore WHERE user_id IS NULL LIMIT :batch
+        )
+    """)
+    print(f"paperstore.user_id, paper_id 백필: {updated}건")
+
+    s.exec(text( # type: ignore
+        "CREATE INDEX IF NOT EXISTS ix_paperstore_user_id_paper_id "
+        "ON paperstore (user_id, paper_id)"
+    ))
+    s.commit()
+
+
+def paper_store_result_columns(s: Session) -> None:
+    """ 제출 결과(score, submitted, problem_count)를 컬럼으로 저장하고 기존 문제지를 채점해서 채웁니다. """
+    s.exec(text("ALTER TABLE paperstore ADD COLUMN IF NOT EXISTS score DOUBLE PRECISION")) # type: ignore
+    s.exec(text("ALTER TABLE paperstore ADD COLUMN IF NOT EXISTS submitted BOOLEAN NOT NULL DEFAULT false")) # type: ignore
+    s.exec(text("ALTER TABLE paperstore ADD COLUMN IF NOT EXISTS problem_count INTEGER")) # type: ignore
+    s.commit()
+
+    # 기존 행은 created_at/updated_at 차이로 제출여부를 판단했었음
+    updated = _in_batches(s, """
+        UPDATE paperstore
+        SET problem_count = jsonb_array_length(value -> 'problems'),
+            submitted = abs(extract(epoch FROM updated_at - created_at)) >= 1
+        WHERE ctid IN (
+            SELECT ctid FROM paperstore WHERE problem_count IS NULL LIMIT :batch
+        )
+    """)
+    print(f"paperstore.submitted, problem_count 백필: {updated}건")
+
+    scored = 0
+    while True:
+        rows = s.exec(text( # type: ignore
+            "SELECT prefix, key, value FROM paperstore "
+            "WHERE submitted AND score IS NULL LIMIT :batch"
+        ).bindparams(batch=BATCH_SIZE)).all()
+        if not rows:
+            break
+
+        params = [
+            dict(
+                prefix=prefix,
+                key=key,
+                score=PaperView(value).calculate_score(),
+            )
+            for prefix, key, value in rows
+        ]
+        s.exec(text( # type: ignore
+            "UPDATE paperstore SET score = :score WHERE prefix = :prefix AND key = :key"
+        ), params=params) # type: ignore
+        s.commit()
+        scored += len(params)
+
+    print(f"paperstore.score 백필: {scored}건")
+
+
+def paper_store_submitted_index(s: Session) -> None:
+    """ 제출된 문제지를 유저별 최신순으로 페이지네이션하기 위한 인덱스를 만듭니다. """
+    s.exec(text( # type: ignore
+        "CREATE INDEX IF NOT EXISTS ix_paperstore_user_id_submitted_updated_at "
+        "ON paperstore (user_id, submitted, updated_at)"
+    ))
+    s.commit()
+
+
+def paper_store_export_index(s: Session) -> None:
+    """ 반 전체/기간별 결과 내보내기(제출된 문제지 최신순)를 위한 인덱스를 만듭니다. """
+    s.exec(text( # type: ignore
+        "CREATE INDEX IF NOT EXISTS ix_paperstore_submitted_updated_at_key "
+        "ON paperstore (submitted, updated_at, key)"
+    ))
+    s.commit()
+
+
+def user_type_index(s: Session) -> None:
+    """ 학생 목록(user_type 필터 + 이름순 페이지네이션)을 위한 인덱스를 만듭니다. """
+    s.exec(text( # type: ignore
+        'CREATE INDEX IF NOT EXISTS ix_user_user_type_user_name_id '
+        'ON "user" (user_type, user_name, id)'
+    ))
+    s.commit()
+
+
+def user_name_pattern_index(s: Session) -> None:
+    """ 학생 이름 접두사 검색(LIKE 'prefix%')을 위한 text_pattern_ops 인덱스를 만듭니다. """
+    s.exec(text( # type: ignore
+        'CREATE INDEX IF NOT EXISTS ix_user_user_type_user_name_pattern '
+        'ON "user" (user_type, user_name text_pattern_ops)'
+    ))
+    s.commit()
+
+
+def _value_bytes(s: Session) -> int:
+    return s.exec(text("SELECT coalesce(sum(pg_column_size(value)), 0) FROM paperstore")).one()[0] # type: ignore
+
+
+def paper_store_compact_values(s: Session) -> None:
+    """
+    v1(Paper.model_dump) 로 저장된 문제지를 v2(Text.id 참조) 형식으로 바꿉니다.
+    단어장에서 삭제된 단어가 있는 문제지는 되살릴 수 없으므로 v1으로 남겨둡니다.
+    """
+    before = _value_bytes(s)
+    vocab = vocabulary.get()
+
+    compacted, skipped = 0, 0
+    last = ("", "")
+    while True:
+        rows = s.exec(text( # type: ignore
+            "SELECT prefix, key, value FROM paperstore "
+            "WHERE value ->> 'v' IS NULL AND (prefix, key) > (:prefix, :key) "
+            "ORDER BY prefix, key LIMIT :batch"
+        ).bindparams(prefix=last[0], key=last[1], batch=BATCH_SIZE)).all()
+        if not rows:
+            break
+        last = (rows[-1][0], rows[-1][1])
+
+        params = []
+        for prefix, key, value in rows:
+            paper = decode_paper(value)
+            text_ids = {c.text.id for p in paper.problems for c in p.candidates}
+            if not text_ids.issubset(vocab.positions):
+                skipped += 1
+                continue
+
+            params.append(dict(prefix=prefix, key=key, value=json.dumps(encode_paper(paper))))
+
+        if params:
+            s.exec(text( # type: ignore
+                "UPDATE paperstore SET value = CAST(:value AS JSONB) WHERE prefix = :prefix AND key = :key"
+            ), params=params) # type: ignore
+            s.commit()
+        compacted += len(params)
+
+    after = _value_bytes(s)
+    print(f"paperstore.value 압축: {compacted}건 (단어가 없어 건너뜀: {skipped}건)")
+    if before:
+        print(f"paperstore.value 크기: {before:,} -> {after:,} bytes ({after / before:.1%})")
+
+
+def word_stats_backfill(s: Session) -> None:
+    """
+    제출된 문제지들로 textstat, usertextstat 을 처음 한번 채웁니다. (이후로는 제출할때 누적됨)
+    이미 값이 있으면 건너뜁니다. 도중에 실패했다면 두 테이블을 TRUNCATE 하고 다시 실행해야 합니다.
+    """
+    if s.exec(text("SELECT EXISTS (SELECT 1 FROM textstat)")).one()[0]: # type: ignore
+        print("textstat 에 이미 값이 있어서 건너뜀")
+        return
+
+    papers = 0
+    last = ("", "")
+    while True:
+        rows = s.exec(text( # type: ignore
+            "SELECT prefix, key, user_id, updated_at, value FROM paperstore "
+            "WHERE submitted AND (prefix, key) > (:prefix, :key) "
+            "ORDER BY prefix, key LIMIT :batch"
+        ).bindparams(prefix=last[0], key=last[1], batch=BATCH_SIZE)).all()
+        if not rows:
+            break
+        last = (rows[-1][0], rows[-1][1])
+
+        texts, users = {}, {}
+        for _, _, user_id, updated_at, value in rows:
+            for text_id, correct in PaperView(value).answer_results():
+                for counters, key in ((texts, text_id), (users, (user_id, text_id))):
+                    shown, corrected, seen = counters.get(key, (0, 0, updated_at))
+                    counters[key] = (shown + 1, corrected + int(correct), max(seen, updated_at))
+
+        add_counters(s, texts, users)
+        papers += len(rows)
+
+    print(f"단어 통계 백필: 문제지 {papers}건")
+
+
+MIGRATIONS = [
+    paper_store_namespace_columns,
+    paper_store_result_columns,
+    paper_store_submitted_index,
+    paper_store_compact_values,
+    paper_store_export_index,
+    user_type_index,
+    user_name_pattern_index,
+    word_stats_backfill,
+]
+
+
+if __name__ == "__main__":
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as s:
+        for migration in MIGRATIONS:
+            print(f"적용중: {migration.__name__}")
+            migration(s)
@@ -0,0 +1,53 @@
+"""
+저장된 점수(paperstore.score)를 현재 난이도 가중치(settings.DIFFICULTY_WEIGHT_*)로 다시 채점합니다.
+
+    python -m app.data.rescore
+
+저장된 점수는 제출할 때의 가중치로 고정되어 있으므로, 가중치를 바꾼 뒤 예전 제출까지 새 가중치로
+보려면 이 명령을 한번 실행해야 합니다. (실행하지 않으면 결과 조회/통계에 두 가중치의 점수가 섞임)
+문제지는 BATCH_SIZE장씩 score_papers로 한번에 채점하고, 점수가 바뀐 행만 배치마다 커밋합니다.
+여러번 실행해도 안전합니다.
+"""
+from sqlmodel import Session, text
+
+from app.core.db import engine
+from app.managers.analyzer import PaperColumns
+
+BATCH_SIZE = 10_000
+
+
+def rescore_submitted(s: Session) -> int:
+    """ 제출된 문제지를 모두 다시 채점하고, 점수가 바뀐 행의 수를 리턴합니다. """
+    changed = 0
+    last = ("", "")
+    while True:
+        rows = s.exec(text( # type: ignore
+            "SELECT prefix, key, score, value FROM paperstore "
+            "WHERE submitted AND (prefix, key) > (:prefix, :key) "
+            "ORDER BY prefix, key LIMIT :batch"
+        ).bindparams(prefix=last[0], key=last[1], batch=BATCH_SIZE)).all()
+        if not rows:
+            break
+        last = (rows[-1][0], rows[-1][1])
+
+        # score를 None으로 넘기면 from_rows가 현재 가중치로 한번에 채점함
+        scores = PaperColumns.from_rows((prefix, None, value) for prefix, _, _, value in rows).scores
+
+        params = [
+            dict(prefix=prefix, key=key, score=float(new))
+            for (prefix, key, old, _), new in zip(rows, scores.tolist())
+            if old is None or old != new
+        ]
+        if params:
+            s.exec(text( # type: ignore
+                "UPDATE paperstore SET score = :score WHERE prefix = :prefix AND key = :key"
+            ), params=params) # type: ignore
+            s.commit()
+        changed += len(params)
+
+    return changed
+
+
+if __name__ == "__main__":
+    with Session(engine) as s:
+        print(f"paperstore.score 재채점: {rescore_submitted(s)}건")
@@ -1,15 +1,18 @@
 import jwt
-from collections.abc import Generator
+import time
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 
-from app.core.db import engine
+from app.core.db import engine, async_engine
 from app.core.config import settings
+from app.core.cache import user_cache, token_cache
 from app.schemas import Payload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -20,22 +23,45 @@ def get_db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         yield session
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # 커밋 후에도 응답을 만들 때 속성을 다시 읽지 않도록 expire 하지 않음
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
 security = HTTPBearer()
 
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
+
+def decode_token(token: str) -> Payload:
+    """ 같은 토큰은 만료될때까지 다시 디코딩하지 않습니다. """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+    decoded = jwt.decode(token, settings.SECRET_KEY, algorithms=settings.JWT_ALGORITHM)
+    payload = Payload(**decoded)
+    token_cache.set(token, payload, ttl=payload.exp.timestamp() - time.time())
+    return payload
+
+async def get_current_user(session: AsyncSessionDep, token: TokenDep) -> User:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=settings.JWT_ALGORITHM)
-        payload = Payload(**payload)
+        payload = decode_token(token)
     except (InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = User.get(db = session, name=payload.sub)
+
+    user = user_cache.get(payload.sub)
+    if user is None:
+        user = await User.aget(db = session, name=payload.sub)
+        if user:
+            # 세션에 묶이지 않은 사본을 캐시함
+            user_cache.set(payload.sub, User(**user.model_dump()))
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,135 @@
+"""
+유저의 오답 기록으로 정답 단어를 고르는 적응형(간격 반복) 출제입니다.
+
+단어 i의 가중치 = 1 + extra_i
+    extra_i = BOOST * 오답률 * 복습시기
+    오답률 = (틀린 횟수 + 1) / (출제 횟수 + 2)
+    복습시기 = 1 - exp(-마지막으로 본 뒤 지난 일수 / (HALF_LIFE_DAYS * (1 + 맞춘 횟수)))
+
+기록이 없는 단어는 extra가 0이므로, 가중치 합 = 단어 수 + sum(extra) 입니다.
+그래서 (단어 수) / (전체 합) 확률로는 기존처럼 균등하게 뽑고,
+나머지 확률로는 기록이 있는 단어만으로 만든 alias table에서 O(1)로 뽑습니다.
+alias table은 유저마다 한번 만들어서 weights_cache에 둡니다.
+"""
+import math
+import random
+import uuid
+from array import array
+from datetime import datetime
+from typing import Callable, Optional, Sequence, Set
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.cache import weights_cache
+from app.schemas.stats import UserTextStat
+from app.factory.vocabulary import Vocabulary
+
+# 기록 쪽에서 뽑은 단어가 이미 쓰였을 때 다시 시도하는 횟수 (넘으면 균등 추출로 넘어감)
+MAX_TRIES = 8
+
+
+class AliasTable:
+    """ Vose의 alias method. 만드는데 O(n), 뽑는데 O(1) 입니다. """
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        n = len(weights)
+        total = sum(weights)
+        self.prob = array("d", [0.0] * n)
+        self.alias = array("q", [0] * n)
+        if n == 0 or total <= 0:
+            return
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # 부동소수점 오차로 남은 것들은 확률 1
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self) -> int:
+        i = random.randrange(len(self.prob))
+        return i if random.random() < self.prob[i] else self.alias[i]
+
+
+class UserWeights:
+    """ 한 유저의 기록이 있는 단어들(text_ids)과 extra 가중치의 alias table """
+
+    def __init__(self, text_ids: Sequence[int], extras: Sequence[float]) -> None:
+        self.text_ids = array("q", text_ids)
+        self.total_extra = float(sum(extras))
+        self.table = AliasTable(extras)
+
+    def __len__(self) -> int:
+        return len(self.text_ids)
+
+    @classmethod
+    def from_stats(cls, rows: Sequence, now: datetime) -> "UserWeights":
+        """ rows: (text_id, shown, correct, last_seen) """
+        text_ids, extras = [], []
+        for text_id, shown, correct, last_seen in rows:
+            error_rate = (shown - correct + 1) / (shown + 2)
+            days = max((now - last_seen).total_seconds() / 86400, 0.0) if last_seen else math.inf
+            due = 1 - math.exp(-days / (settings.ADAPTIVE_HALF_LIFE_DAYS * (1 + correct)))
+            extra = settings.ADAPTIVE_BOOST * error_rate * due
+            if extra > 0:
+                text_ids.append(text_id)
+                extras.append(extra)
+
+        return cls(text_ids, extras)
+
+    def answer_picker(self, pool: Vocabulary) -> Callable[[Set[int]], Optional[int]]:
+        """
+        draw_groups에 넘길 정답 선택 함수를 만듭니다.
+        None을 리턴하면 draw_groups가 기존처럼 균등하게 뽑습니다.
+        """
+        uniform = len(pool)
+        total = uniform + self.total_extra
+
+        def pick(used: Set[int]) -> Optional[int]:
+            for _ in range(MAX_TRIES):
+                if len(self.table) == 0 or random.random() * total < uniform:
+                    return None
+
+                i = pool.positions.get(self.text_ids[self.table.draw()])
+                # 단어장에서 지워졌거나(DB 추출 pool이면 pool에 없거나) 이미 쓰인 단어
+                if i is not None and i not in used:
+                    return i
+
+            return None
+
+        return pick
+
+
+def load_user_weights(db: Session, user_id: uuid.UUID, vocab: Vocabulary) -> Optional[UserWeights]:
+    """
+    유저의 가중치를 캐시에서 꺼내거나 usertextstat으로 만듭니다.
+    풀어본 단어가 ADAPTIVE_MIN_HISTORY개보다 적으면 None (균등 출제)
+    """
+    key = (user_id, vocab.version)
+    weights = weights_cache.get(key)
+    if weights is None:
+        stmt = (
+            select(UserTextStat.text_id, UserTextStat.shown, UserTextStat.correct, UserTextStat.last_seen)
+            .where(UserTextStat.user_id == user_id)
+        )
+        rows = db.exec(stmt).all()
+        if len(rows) >= settings.ADAPTIVE_MIN_HISTORY:
+            weights = UserWeights.from_stats(rows, datetime.now())
+        else:
+            # 기록이 모자란 유저도 캐시해서 매 요청마다 조회하지 않도록 함
+            weights = UserWeights([], [])
+        weights_cache.set(key, weights)
+
+    return weights if len(weights) > 0 else None
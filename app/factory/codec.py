@@ -0,0 +1,285 @@
+"""
+PaperStore.value 에 저장하는 문제지 형식입니다.
+
+v1 (버전 필드 없음): Paper.model_dump(mode="json") 그대로. 보기마다 Text 행 전체가 복사됨
+v2: 단어는 Text.id만 저장하고, 읽을때 단어장 캐시에서 되살립니다.
+
+    {
+        "v": 2,
+        "id": 문제지 id,
+        "b": 바인딩된 유저 (UserDTO),
+        "p": 문제 u_id 목록 (hex),
+        "i": 문제 id 목록,
+        "d": 난이도 코드 목록,
+        "q": 문제 유형 코드 목록,
+        "t": 문제별 보기의 Text.id 목록,
+        "a": 문제별 정답 보기의 위치,
+        "k": 문제별 체크한 보기의 위치 (없으면 -1),
+        "c": 문제별 보기 u_id 목록 (hex). candidate_u_id로 만든 u_id가 아닐때만 저장
+    }
+
+answer_map은 p, a, c 로 다시 만들 수 있으므로 저장하지 않습니다.
+v2로 표현할 수 없는 문제지(보기 id가 위치와 다르거나 정답/체크가 여러개)는 v1로 저장합니다.
+"""
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas.enum import Difficulty, QType, Tag
+from app.schemas.problem import Candidate, Problem, Text, candidate_u_id
+from app.schemas.test_paper import Paper, difficulty_weights, weighted_score
+from app.schemas.auth import UserDTO
+from app.factory.vocabulary import Vocabulary, vocabulary
+
+VERSION = 2
+
+# 저장되는 코드이므로 순서를 바꾸면 안됨 (새 값은 뒤에 추가)
+DIFFICULTY_CODES = (Difficulty.EASY, Difficulty.MODERATE, Difficulty.HARD)
+QTYPE_CODES = (QType.KOREAN, QType.ENGLISH)
+
+
+def weight_codes() -> List[float]:
+    """ 난이도 코드 -> 채점 가중치 (DIFFICULTY_CODES 순서) """
+    weights = difficulty_weights()
+    return [weights[d] for d in DIFFICULTY_CODES]
+
+
+def _is_compactable(problem: Problem) -> bool:
+    answers = [c for c in problem.candidates if c.answer]
+    checked = [c for c in problem.candidates if c.checked]
+    return (
+        all(c.id == i for i, c in enumerate(problem.candidates))
+        and len(answers) == 1
+        and len(checked) <= 1
+    )
+
+
+def _position(candidates: List[Candidate], flag: str) -> int:
+    for i, c in enumerate(candidates):
+        if getattr(c, flag):
+            return i
+    return -1
+
+
+def encode_paper(paper: Paper) -> Dict:
+    """ Paper를 v2 형식으로 만듭니다. v2로 표현할 수 없으면 v1(model_dump) 을 리턴합니다. """
+    if not all(_is_compactable(p) for p in paper.problems):
+        return paper.model_dump(mode="json")
+
+    encoded = {
+        "v": VERSION,
+        "id": str(paper.id),
+        "b": paper.binded.model_dump(mode="json"),
+        "p": [p.u_id.hex for p in paper.problems],
+        "i": [p.id for p in paper.problems],
+        "d": [DIFFICULTY_CODES.index(p.difficulty) for p in paper.problems],
+        "q": [QTYPE_CODES.index(p.question_type) for p in paper.problems],
+        "t": [[c.text.id for c in p.candidates] for p in paper.problems],
+        "a": [_position(p.candidates, "answer") for p in paper.problems],
+        "k": [_position(p.candidates, "checked") for p in paper.problems],
+    }
+
+    derived = all(
+        c.u_id == candidate_u_id(p.u_id, i)
+        for p in paper.problems
+        for i, c in enumerate(p.candidates)
+    )
+    if not derived:
+        encoded["c"] = [[c.u_id.hex for c in p.candidates] for p in paper.problems]
+
+    return encoded
+
+
+def _texts(value: Dict, vocab: Optional[Vocabulary]) -> Vocabulary:
+    """ 문제지의 단어가 모두 있는 단어장을 리턴합니다. 없으면 캐시를 한번 갱신해보고 그래도 없으면 ValueError """
+    text_ids = {text_id for row in value["t"] for text_id in row}
+
+    if vocab is not None:
+        if not text_ids.issubset(vocab.positions):
+            raise ValueError("문제지의 단어가 단어장에 없습니다.")
+        return vocab
+
+    found = vocabulary.get()
+    if text_ids.issubset(found.positions):
+        return found
+
+    # 문제지를 만든 뒤에 단어가 추가됐는데 아직 캐시가 갱신되지 않았을 수 있음
+    vocabulary.invalidate()
+    found = vocabulary.get()
+    if not text_ids.issubset(found.positions):
+        raise ValueError("문제지의 단어가 단어장에 없습니다. (삭제된 단어)")
+    return found
+
+
+def _construct_v1(value: Dict) -> Paper:
+    """ 서버가 저장한 v1 문제지를 검증 없이(model_construct) 만듭니다. """
+    problems = []
+    for p in value["problems"]:
+        candidates = [
+            Candidate.model_construct(
+                id=c["id"],
+                u_id=uuid.UUID(c["u_id"]),
+                text=Text(
+                    id=c["text"]["id"],
+                    name=c["text"]["name"],
+                    tag=Tag(c["text"]["tag"]),
+                    k_description=c["text"]["k_description"],
+                ),
+                answer=c["answer"],
+                checked=c["checked"],
+            )
+            for c in p["candidates"]
+        ]
+        problems.append(Problem.model_construct(
+            id=p["id"],
+            u_id=uuid.UUID(p["u_id"]),
+            difficulty=Difficulty(p["difficulty"]),
+            question_type=QType(p["question_type"]),
+            candidates=candidates,
+        ))
+
+    return Paper.model_construct(
+        id=uuid.UUID(value["id"]),
+        binded=UserDTO.model_validate(value["binded"]),
+        answer_map=value["answer_map"],
+        problems=problems,
+    )
+
+
+def decode_paper(value: Dict, vocab: Optional[Vocabulary] = None) -> Paper:
+    """ PaperStore.value를 Paper로 되살립니다. v1, v2 모두 읽을 수 있습니다. """
+    return PaperView(value).to_paper(vocab)
+
+
+def _v1_answer(problem: Dict) -> Dict:
+    for c in problem["candidates"]:
+        if c["answer"]:
+            return c
+    raise ValueError("정답이 없습니다.")
+
+
+class PaperView:
+    """
+    저장된 문제지(dict)를 Paper로 만들지 않고 다루는 가벼운 view 입니다.
+    채점, 제출 반영, 메타정보는 저장된 값만 보고 처리하고 (v1은 dict를 그대로 읽음)
+    단어가 필요한 경우(to_paper)에만 Paper와 Text를 만듭니다.
+
+    PaperStore에 서버가 직접 쓴 값만 넘겨야 합니다. (pydantic 검증을 하지 않음)
+    """
+
+    def __init__(self, value: Dict) -> None:
+        if value.get("v") not in (None, VERSION):
+            raise ValueError(f"알 수 없는 문제지 형식입니다. (v={value['v']})")
+
+        self.value = value
+        self._v1 = value.get("v") is None
+
+    @property
+    def id(self) -> uuid.UUID:
+        return uuid.UUID(self.value["id"])
+
+    @property
+    def binded(self) -> UserDTO:
+        return UserDTO.model_validate(self.value["binded"] if self._v1 else self.value["b"])
+
+    def get_p_counts(self) -> int:
+        return len(self.value["problems"] if self._v1 else self.value["p"])
+
+    def _candidate_u_ids(self, n: int) -> List[uuid.UUID]:
+        if "c" in self.value:
+            return [uuid.UUID(u_id) for u_id in self.value["c"][n]]
+
+        problem_u_id = uuid.UUID(self.value["p"][n])
+        return [candidate_u_id(problem_u_id, i) for i in range(len(self.value["t"][n]))]
+
+    def set_checked(self, checked_map: Dict[uuid.UUID, uuid.UUID]) -> "PaperView":
+        """ TestPaper.checked_map()을 반영합니다. (TestPaper.apply_changes와 같은 동작) """
+        if self._v1:
+            for p in self.value["problems"]:
+                checked = checked_map.get(uuid.UUID(p["u_id"]))
+                if checked is None:
+                    continue
+                for c in p["candidates"]:
+                    c["checked"] = uuid.UUID(c["u_id"]) == checked
+            return self
+
+        for n, problem_hex in enumerate(self.value["p"]):
+            checked = checked_map.get(uuid.UUID(problem_hex))
+            if checked is None:
+                continue
+
+            u_ids = self._candidate_u_ids(n)
+            self.value["k"][n] = u_ids.index(checked) if checked in u_ids else -1
+
+        return self
+
+    def calculate_score(self) -> float:
+        """ Paper.calculate_score와 같은 계산을 저장된 값으로 합니다. """
+        if self._v1:
+            table = difficulty_weights()
+            weights = [table[Difficulty(p["difficulty"])] for p in self.value["problems"]]
+            results = [_v1_answer(p)["checked"] for p in self.value["problems"]]
+        else:
+            table = weight_codes()
+            weights = [table[d] for d in self.value["d"]]
+            results = [a == k for a, k in zip(self.value["a"], self.value["k"])]
+
+        corrected = 0
+        for weight, correct in zip(weights, results):
+            if correct:
+                corrected += weight
+
+        return weighted_score(corrected, sum(weights))
+
+    def answer_results(self) -> List[Tuple[int, bool]]:
+        """ 문제별 (정답 단어의 Text.id, 맞았는지) 목록. 단어 통계용입니다. """
+        if self._v1:
+            answers = [_v1_answer(p) for p in self.value["problems"]]
+            return [(c["text"]["id"], bool(c["checked"])) for c in answers]
+
+        return [
+            (t[a], a == k)
+            for t, a, k in zip(self.value["t"], self.value["a"], self.value["k"])
+        ]
+
+    def to_value(self) -> Dict:
+        """ PaperStore에 다시 저장할 값. v1은 v1 그대로 저장합니다. (압축은 migration에서) """
+        return self.value
+
+    def to_paper(self, vocab: Optional[Vocabulary] = None) -> Paper:
+        """ 단어장에서 Text를 꺼내 Paper를 만듭니다. (검증 없이 model_construct, v1은 저장된 Text 그대로) """
+        if self._v1:
+            return _construct_v1(self.value)
+
+        value = self.value
+        texts = _texts(value, vocab)
+
+        problems = []
+        answer_map = {}
+        for n, problem_hex in enumerate(value["p"]):
+            problem_u_id = uuid.UUID(problem_hex)
+            u_ids = self._candidate_u_ids(n)
+            candidates = [
+                Candidate.model_construct(
+                    id=i,
+                    u_id=u_ids[i],
+                    text=texts.text_by_id(text_id),
+                    answer=(i == value["a"][n]),
+                    checked=(i == value["k"][n]),
+                )
+                for i, text_id in enumerate(value["t"][n])
+            ]
+            problems.append(Problem.model_construct(
+                id=value["i"][n],
+                u_id=problem_u_id,
+                difficulty=DIFFICULTY_CODES[value["d"][n]],
+                question_type=QTYPE_CODES[value["q"][n]],
+                candidates=candidates,
+            ))
+            answer_map[str(problem_u_id)] = str(u_ids[value["a"][n]])
+
+        return Paper.model_construct(
+            id=uuid.UUID(value["id"]),
+            binded=UserDTO.model_validate(value["b"]),
+            answer_map=answer_map,
+            problems=problems,
+        )
@@ -1,11 +1,18 @@
 import uuid
-import collections
 import random
-from sqlmodel import select, Session
-from typing import List, Optional
+from sqlmodel import Session
+from typing import Iterable, Iterator, List, Optional
 from pydantic import BaseModel, Field
 
-from app.schemas.problem import Candidate, Problem, Text
+from app.schemas.enum import SamplingMode
+from app.schemas.problem import Candidate, Problem, Text, candidate_u_id
+from app.factory.vocabulary import Vocabulary, vocabulary
+from app.factory.sampler import TextSampler, MemorySampler, DatabaseSampler, iter_groups
+from app.factory.adaptive import UserWeights
+
+class InvalidProblem(ValueError):
+    """ 만들 수 없는 크기(문제 1개, 보기 2개 미만)이거나 prepare 단계에서 검증에 실패한 문제지 """
+
 
 class Exportation(BaseModel):
     id: uuid.UUID = Field(default_factory=uuid.uuid4)
@@ -14,6 +21,10 @@ class Exportation(BaseModel):
 
 
 class ProblemFactory:
+    """
+    문제지 한장을 만듭니다. 단계들은 문제를 하나씩 넘기는 제너레이터로 이어져 있어서
+    단어 추출 -> 생성 -> 답 주입 -> 검증을 문제 하나씩 한번에 통과하고, 리스트는 export에서 한번만 만들어집니다.
+    """
 
     def __init__(
         self, 
@@ -21,10 +32,13 @@ class ProblemFactory:
         texts: Optional[List[Text]] = None,
         candidate_limit: int = 4, 
         problems_count: int = 20,
-        
+        sampling: SamplingMode = SamplingMode.MEMORY,
+        weights: Optional[UserWeights] = None,
         
     ) -> None:
-        """ 차후에 옵션값을 줘서 문제 생성시 옵션값을 줄 수 있도록 수정할 예정입니다. """
+        if problems_count < 1 or candidate_limit < 2:
+            raise InvalidProblem('문제는 1개, 보기는 2개 이상이어야 합니다.')
+
         self.candidate_limit = candidate_limit
         self.problems_count = problems_count
         if not db_session:
@@ -32,105 +46,123 @@ class ProblemFactory:
         
         self.db_session = db_session
         
-        all_texts = texts if texts else self._load_texts()
-        if len(all_texts) < problems_count * candidate_limit:
+        self.sampler = self._make_sampler(sampling, texts)
+        if self.sampler.size() < problems_count * candidate_limit:
             raise ValueError('문제 수가 부족합니다.')
 
-        self.choised_texts = self._choice_texts(all_texts, k=(self.problems_count * self.candidate_limit))
+        # 단어는 run_pipeline에서 뽑음 (그 전에 adapt()로 가중치를 줄 수 있도록)
+        self.weights = weights
 
         answer_map = {}
         for i in range(self.problems_count):
-            answer_map[i] = random.choice(range(self.candidate_limit))
+            answer_map[i] = random.randrange(self.candidate_limit)
 
         self.answer_map = answer_map
         
 
+    def adapt(self, weights: Optional[UserWeights]) -> "ProblemFactory":
+        """ 정답 단어를 유저의 기록(UserWeights)에 따라 고르도록 합니다. None이면 균등 추출 """
+        self.weights = weights
+        return self
+
     def run_pipeline(
         self,
         
-    ):
-        problems = self.create_problems()
-        problems =  self.inject_answer(problems)
+    ) -> Optional[Exportation]:
+        groups = self._choice_texts(self.sampler, k=(self.problems_count * self.candidate_limit))
+        problems = self.create_problems(groups)
+        problems = self.inject_answer(problems)
         problems = self.prepare(problems)
-        if problems:
+        try:
             return self.export(problems)
+        except InvalidProblem:
+            return None
 
 
-    def _load_texts(self) -> List[Text]:
+    def _make_sampler(self, sampling: SamplingMode, texts: Optional[List[Text]]) -> TextSampler:
         
-        stmt = select(Text)
-        with self.db_session as s:
-            texts = list(s.exec(stmt).fetchall())
+        if texts:
+            return MemorySampler(Vocabulary.from_texts(texts))
         
-        return texts
+        match sampling:
+            case SamplingMode.DATABASE:
+                return DatabaseSampler(self.db_session)
+            case _:
+                return MemorySampler(vocabulary.get())
 
-    def _choice_texts(self, texts: List[Text], k: int) -> List[Text]:
-        
-        choised = random.choices(texts, k=k)
-        print(f"총 **{k}**개 만큼의 랜덤한 영단어목록이 **{len(texts)}** 에서 추출되었습니다.")
-        
-        return choised
+    def _choice_texts(self, sampler: TextSampler, k: int) -> Iterator[List[Text]]:
+        """ 
+        문제마다 [정답, 오답...] 순서의 Text 묶음을 하나씩 만듭니다.
+        단어는 비복원추출되고, 뽑힌 k개만 Text로 만들어집니다.
+        """
+
+        pool = sampler.pool(k)
+        pick_answer = self.weights.answer_picker(pool) if self.weights else None
+        print(f"총 **{k}**개 만큼의 랜덤한 영단어목록을 **{sampler.size()}** 에서 추출합니다.")
 
-    def create_problems(self)-> List[Problem]:
+        for group in iter_groups(pool, self.problems_count, self.candidate_limit, pick_answer):
+            yield [pool.text(i) for i in group]
+
+    def create_problems(self, groups: Iterable[List[Text]]) -> Iterator[Problem]:
         """ 
-        생성자의 promblems_count만큼의 문제를 생성합니다. 
+        단어 묶음마다 문제를 하나씩 생성합니다. 
         이 단계에서는 단순히 문제를 '생성' 하는 단계이지, 절대 '준비' 하는 단계는 아님.
         """
 
-        choised = self.choised_texts
-        random.shuffle(choised)
+        for current_problem_id, group in enumerate(groups):
 
-        it = iter(choised)
-        
-        problems= []
-        for current_problem_id in range(self.problems_count):
+            # 정답(group[0])은 answer_map이 가리키는 자리에 놓음
+            answer, *texts = group
+            texts.insert(self.answer_map[current_problem_id], answer)
 
-            candidates = []
-            for i in range(self.candidate_limit):
-                candidate = Candidate(id=i, text=next(it))
-                candidates.append(candidate)
-            
-            problems.append(Problem(id=current_problem_id, candidates=candidates))
+            problem_u_id = uuid.uuid4()
+            candidates = [
+                Candidate(id=i, u_id=candidate_u_id(problem_u_id, i), text=text)
+                for i, text in enumerate(texts)
+            ]
             
-
-        print("문제가 생성 되었습니다 > 생성 단계 완료")
-        return problems
+            yield Problem(id=current_problem_id, u_id=problem_u_id, candidates=candidates)
     
 
-    def inject_answer(self, problems: List[Problem]):
+    def inject_answer(self, problems: Iterable[Problem]) -> Iterator[Problem]:
 
         answer_map = self.answer_map
-        for i, problem in enumerate(problems):
-            answer_candidate_id = answer_map[i]
-            problem.candidates[answer_candidate_id].answer = True
-
-        print("문제에 답주입을 완료했습니다 > 답 주입단계 완료")
-        return problems
+        for problem in problems:
+            problem.candidates[answer_map[problem.id]].answer = True
+            yield problem
 
-    def prepare(self, unprepared: List[Problem]):
-        
+    def prepare(self, unprepared: Iterable[Problem]) -> Iterator[Problem]:
+        """
+        문제를 검증하면서 answer map을 실제 candidate의 u_id로 재매핑합니다.
+        검증에 실패하면 InvalidProblem을 던집니다.
+        """
 
-        print("answer map과 candidates들을 실제 candidate의 u_id로 재매핑합니다.")
         new_map = {}
+        # 한 문제지 안에서 같은 단어가 두번 나오면 안됨
+        seen_texts = set()
         for problem in unprepared:
-            answer = problem.get_answer_obj()
-            new_map[problem.u_id] = answer.u_id
-        
-        self.answer_map = new_map
-        
-        try:
-            for problem in unprepared:
+            try:
                 problem.validate()
-        except ValueError:
-            return None
-        
+            except ValueError as e:
+                raise InvalidProblem(str(e))
+
+            for c in problem.candidates:
+                if c.text.id in seen_texts:
+                    raise InvalidProblem("한 문제지에 같은 단어가 두번 나옵니다.")
+                seen_texts.add(c.text.id)
+
+            new_map[problem.u_id] = problem.get_answer_obj().u_id
+            yield problem
+
+        self.answer_map = new_map
         print("문제검증을 완료했습니다 > 문제 검증 완료")
-        prepared = unprepared
-        return prepared
     
-    def export(self, prepared):
+    def export(self, prepared: Iterable[Problem]) -> Exportation:
+        """ 파이프라인을 끝까지 돌려서 문제 리스트를 한번만 만듭니다. (검증이 끝난 문제라 다시 검증하지 않음) """
+        problems = list(prepared)
         
-        return Exportation(   
+        return Exportation.model_construct(
+            id=uuid.uuid4(),
             answer_map=self.answer_map,
-            problems=prepared
-        )
\ No newline at end of file
+            problems=problems
+        )
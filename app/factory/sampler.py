@@ -0,0 +1,227 @@
+import math
+import random
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Sequence, Set
+
+from sqlmodel import Session, select, func, text as sql_text
+from sqlalchemy import tablesample
+
+from app.schemas.enum import Tag
+from app.schemas.problem import Text
+from app.factory.vocabulary import Vocabulary
+
+
+class TextSampler(Protocol):
+    """ ProblemFactory가 문제에 쓸 단어를 뽑을 단어장(pool)을 마련하는 방법입니다. """
+
+    def size(self) -> int:
+        ...
+
+    def pool(self, k: int) -> Vocabulary:
+        ...
+
+
+class MemorySampler:
+    """ 프로세스에 캐시된 단어장 전체를 그대로 pool로 씁니다. """
+
+    def __init__(self, vocab: Vocabulary) -> None:
+        self.vocab = vocab
+
+    def size(self) -> int:
+        return len(self.vocab)
+
+    def pool(self, k: int) -> Vocabulary:
+        return self.vocab
+
+
+class DatabaseSampler:
+    """
+    단어장을 메모리에 올리지 않고 Postgres에서 k개의 행만 가져옵니다.
+
+    1. Text.id 의 [min, max] 범위에서 임의의 id를 뽑아 PK 인덱스로 조회 (max_rounds번)
+       id 공간이 너무 듬성듬성하면(min_density 미만) 건너뜀
+    2. 모자라면 TABLESAMPLE BERNOULLI로 보충
+    3. 그래도 모자라면 ORDER BY random() LIMIT 으로 나머지만 채움
+    """
+
+    max_rounds = 3
+    # 한번에 IN (...) 으로 보내는 id 수 상한 (바인드 파라미터는 65535개까지)
+    max_guesses = 2000
+    # 이보다 듬성듬성하면 id를 찍어봐도 거의 빗나가므로 바로 TABLESAMPLE
+    min_density = 0.05
+
+    def __init__(self, db_session: Session) -> None:
+        self.db_session = db_session
+        self._low, self._high = self.db_session.exec(
+            select(func.min(Text.id), func.max(Text.id))
+        ).one()
+        # count(*)는 천만 건에서 풀스캔이므로 통계값(reltuples)을 사용함
+        estimated = self.db_session.exec(
+            sql_text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass('text')") # type: ignore
+        ).scalar()
+        self._estimated = max(int(estimated or 0), 0)
+
+    def size(self) -> int:
+        if self._low is None:
+            return 0
+        if self._estimated <= 0:
+            # 한번도 ANALYZE 되지 않은 테이블
+            return self._high - self._low + 1
+        return self._estimated
+
+    def _density(self) -> float:
+        span = self._high - self._low + 1
+        return min(1.0, max(self.size() / span, 1e-6))
+
+    def pool(self, k: int) -> Vocabulary:
+        """ 같은 품사 오답을 고를 여유가 있도록 k의 두배를 가져옵니다. """
+        return Vocabulary.from_texts(self.sample(min(k * 2, self.size())))
+
+    def sample(self, k: int) -> List[Text]:
+        if self._low is None:
+            return []
+
+        picked: List[Text] = []
+        seen: Set[int] = set()
+
+        rounds = self.max_rounds if self._density() >= self.min_density else 0
+        for _ in range(rounds):
+            need = k - len(picked)
+            if need <= 0:
+                break
+            picked += self._by_id_range(need, seen)
+
+        if len(picked) < k:
+            picked += self._by_tablesample(k - len(picked), seen)
+
+        if len(picked) < k:
+            picked += self._by_random_order(k - len(picked), seen)
+
+        return picked[:k]
+
+    def _take(self, rows, need: int, seen: Set[int]) -> List[Text]:
+        fresh = [row for row in rows if row.id not in seen]
+        if len(fresh) > need:
+            fresh = random.sample(fresh, need)
+        for row in fresh:
+            seen.add(row.id)
+        return fresh
+
+    def _by_id_range(self, need: int, seen: Set[int]) -> List[Text]:
+        guesses = min(math.ceil(need / self._density() * 1.2) + 8, need * 8, self.max_guesses)
+        ids = {random.randint(self._low, self._high) for _ in range(guesses)} - seen
+        stmt = select(Text).where(Text.id.in_(ids)) # type: ignore
+        return self._take(self.db_session.exec(stmt).all(), need, seen)
+
+    def _by_tablesample(self, need: int, seen: Set[int]) -> List[Text]:
+        percent = min(100.0, need * 3 / max(self.size(), 1) * 100)
+        sampled = tablesample(Text.__table__, func.bernoulli(percent)) # type: ignore
+        stmt = select(
+            sampled.c.id, sampled.c.name, sampled.c.tag, sampled.c.k_description
+        ).limit(need * 3)
+        rows = [
+            Text(id=r.id, name=r.name, tag=r.tag, k_description=r.k_description)
+            for r in self.db_session.exec(stmt).all() # type: ignore
+        ]
+        return self._take(rows, need, seen)
+
+    def _by_random_order(self, need: int, seen: Set[int]) -> List[Text]:
+        stmt = (
+            select(Text)
+            .where(Text.id.not_in(seen)) # type: ignore
+            .order_by(func.random())
+            .limit(need)
+        )
+        return self._take(self.db_session.exec(stmt).all(), need, seen)
+
+
+class _SparseShuffle:
+    """
+    bucket을 복사하거나 섞지 않고 비복원추출합니다.
+    Fisher-Yates 셔플의 swap을 dict에만 기록하므로 draw 한번이 O(1)입니다.
+    """
+
+    def __init__(self, bucket: Sequence[int]) -> None:
+        self.bucket = bucket
+        self.remaining = len(bucket)
+        self.swaps: Dict[int, int] = {}
+
+    def draw(self) -> Optional[int]:
+        if self.remaining == 0:
+            return None
+
+        j = random.randrange(self.remaining)
+        last = self.remaining - 1
+        picked = self.swaps.get(j, j)
+        self.swaps[j] = self.swaps.get(last, last)
+        self.swaps.pop(last, None)
+        self.remaining -= 1
+
+        return self.bucket[picked]
+
+
+def draw_groups(
+    vocab: Vocabulary,
+    problems_count: int,
+    candidate_limit: int,
+    pick_answer: Optional[Callable[[Set[int]], Optional[int]]] = None,
+) -> List[List[int]]:
+    """ iter_groups를 리스트로 모아서 리턴합니다. """
+    return list(iter_groups(vocab, problems_count, candidate_limit, pick_answer))
+
+
+def iter_groups(
+    vocab: Vocabulary,
+    problems_count: int,
+    candidate_limit: int,
+    pick_answer: Optional[Callable[[Set[int]], Optional[int]]] = None,
+) -> Iterator[List[int]]:
+    """
+    문제마다 [정답, 오답, 오답, ...] 형태의 vocab 인덱스 묶음을 하나씩 만듭니다.
+
+    1. 한 문제지 안에서 같은 단어는 한번만 나옴
+    2. 오답은 정답과 같은 품사(tag_buckets)에서 먼저 고르고, 모자라면 전체에서 고름
+    3. 정답 혹은 같은 문제의 다른 보기와 뜻(desc_codes)이 같은 단어는 오답으로 쓰지 않음
+    4. pick_answer가 있으면 정답은 먼저 pick_answer(이미 쓰인 인덱스)로 고르고, None이면 균등하게 고름
+
+    각 인덱스는 셔플러마다 최대 한번만 꺼내지므로, 버려지는 인덱스를 포함해도
+    전체 작업량은 문제지 크기에 비례하고 단어장 크기와는 무관합니다.
+    """
+    used: Set[int] = set()
+    overall = _SparseShuffle(range(len(vocab)))
+    by_tag: Dict[Tag, _SparseShuffle] = {}
+
+    def next_from(shuffler: _SparseShuffle, banned_descs: Set[int]) -> Optional[int]:
+        while True:
+            i = shuffler.draw()
+            if i is None:
+                return None
+            if i in used or vocab.desc_codes[i] in banned_descs:
+                continue
+            return i
+
+    for _ in range(problems_count):
+        answer = pick_answer(used) if pick_answer is not None else None
+        if answer is None:
+            answer = next_from(overall, set())
+        if answer is None:
+            raise ValueError('문제 수가 부족합니다.')
+        used.add(answer)
+
+        group = [answer]
+        banned_descs = {vocab.desc_codes[answer]}
+        tag = vocab.tags[answer]
+        if tag not in by_tag:
+            by_tag[tag] = _SparseShuffle(vocab.tag_buckets[tag])
+
+        while len(group) < candidate_limit:
+            picked = next_from(by_tag[tag], banned_descs)
+            if picked is None:
+                picked = next_from(overall, banned_descs)
+            if picked is None:
+                raise ValueError('문제 수가 부족합니다.')
+
+            used.add(picked)
+            banned_descs.add(vocab.desc_codes[picked])
+            group.append(picked)
+
+        yield group
@@ -0,0 +1,47 @@
+"""
+여러 문제지를 한번에 채점합니다. (Paper.calculate_score / PaperView.calculate_score 의 배열 버전)
+
+문제지 n장, 문제 m개를 문제 단위 배열 세개로 받습니다.
+    paper_index (m): 몇번째 문제지의 문제인지 (0 ~ n-1)
+    difficulty (m): 난이도 코드 (DIFFICULTY_CODES 순서)
+    correct (m): 맞았는지
+
+점수 = 문제지별 맞은 문제 가중치 합 / 전체 가중치 합 * 100 (소수점 둘째 자리로 반올림)
+가중치를 바꿔서 반 전체를 다시 채점할때 문제지마다 파이썬 루프를 돌지 않도록 bincount 두번으로 계산합니다.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.schemas.test_paper import SCORE_DECIMALS
+from app.factory.codec import weight_codes
+
+
+def paper_index_from_counts(counts: Sequence[int]) -> np.ndarray:
+    """ 문제지별 문제 수 -> paper_index (문제지 순서대로 문제가 이어져 있을때) """
+    counts = np.asarray(counts, dtype=np.int64)
+    return np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+
+
+def score_papers(
+    paper_index: np.ndarray,
+    difficulty: np.ndarray,
+    correct: np.ndarray,
+    papers: Optional[int] = None,
+    weights: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    문제지별 점수 (길이 papers) 를 리턴합니다. 문제가 없는 문제지는 0점
+    weights: 난이도 코드별 가중치. 없으면 settings.DIFFICULTY_WEIGHT_*
+    """
+    if papers is None:
+        papers = int(paper_index.max()) + 1 if len(paper_index) else 0
+
+    table = np.asarray(weights if weights is not None else weight_codes(), dtype=np.float64)
+    w = table[difficulty]
+
+    totals = np.bincount(paper_index, weights=w, minlength=papers)
+    corrected = np.bincount(paper_index, weights=np.where(correct, w, 0.0), minlength=papers)
+    scores = np.divide(corrected * 100, totals, out=np.zeros(papers), where=totals > 0)
+    # Paper.calculate_score(weighted_score)와 같은 자리수로 반올림
+    return np.round(scores, SCORE_DECIMALS)
@@ -0,0 +1,142 @@
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlmodel import Session, select, func
+from sqlalchemy import String, cast
+
+from app.core.config import settings
+from app.core.db import engine
+from app.schemas.enum import Tag
+from app.schemas.problem import Text
+
+
+class Vocabulary:
+    """
+    Text 테이블 전체를 병렬 배열로 들고 있는 불변 스냅샷입니다.
+    i번째 단어는 ids[i], names[i], tags[i], k_descriptions[i] 로 표현됩니다.
+    ORM 객체는 실제로 뽑힌 단어에 대해서만 text(i)로 만들어집니다.
+
+    tag_buckets: 품사별 인덱스 목록 (같은 품사 오답을 고를 때 사용)
+    desc_codes: 같은 뜻이면 같은 정수 (뜻이 겹치는 오답을 거를 때 문자열 비교 대신 사용)
+    positions: Text.id -> 인덱스 (저장된 문제지를 text id로 되살릴 때 사용)
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[int],
+        names: Sequence[str],
+        tags: Sequence[Tag],
+        k_descriptions: Sequence[str],
+        version: Tuple = (),
+    ) -> None:
+        self.ids = array("q", ids)
+        self.names = list(names)
+        self.tags = list(tags)
+        self.k_descriptions = list(k_descriptions)
+        self.version = version
+
+        buckets: Dict[Tag, List[int]] = {}
+        codes: Dict[str, int] = {}
+        desc_codes = array("q")
+        for i, (tag, desc) in enumerate(zip(self.tags, self.k_descriptions)):
+            buckets.setdefault(tag, []).append(i)
+            desc_codes.append(codes.setdefault(desc.strip(), len(codes)))
+
+        self.tag_buckets = {tag: array("q", bucket) for tag, bucket in buckets.items()}
+        self.desc_codes = desc_codes
+        self.positions = {text_id: i for i, text_id in enumerate(self.ids)}
+
+    @classmethod
+    def from_texts(cls, texts: List[Text]) -> "Vocabulary":
+        return cls(
+            ids=[t.id for t in texts],
+            names=[t.name for t in texts],
+            tags=[t.tag for t in texts],
+            k_descriptions=[t.k_description for t in texts],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def text(self, index: int) -> Text:
+        """ index번째 단어를 Text로 만들어 리턴합니다. """
+        return Text(
+            id=self.ids[index],
+            name=self.names[index],
+            tag=self.tags[index],
+            k_description=self.k_descriptions[index],
+        )
+
+    def text_by_id(self, text_id: int) -> Text:
+        """ Text.id로 단어를 찾습니다. 단어장에 없으면 KeyError를 냅니다. """
+        return self.text(self.positions[text_id])
+
+
+class VocabularyCache:
+    """
+    프로세스 전역 단어장 캐시입니다.
+    check_interval 초마다 DB의 체크섬(count, max(id), 내용 해시합)을 확인하고
+    바뀌었을 때만 Text 테이블을 다시 읽습니다.
+    """
+
+    def __init__(self, check_interval: float = settings.VOCAB_CACHE_CHECK_SECONDS) -> None:
+        self.check_interval = check_interval
+        self._snapshot: Optional[Vocabulary] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    def get(self) -> Vocabulary:
+        if self._is_fresh():
+            return self._snapshot # type: ignore
+
+        with self._lock:
+            # 락을 기다리는 동안 다른 스레드가 이미 갱신했을 수 있음
+            if self._is_fresh():
+                return self._snapshot # type: ignore
+
+            with Session(engine) as s:
+                version = self._fingerprint(s)
+                if self._snapshot is None or self._snapshot.version != version:
+                    self._snapshot = self._load(s, version)
+                    print(f"단어장 캐시를 다시 읽었습니다. 총 **{len(self._snapshot)}**개")
+
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """ 다음 get()에서 체크섬을 바로 다시 확인하도록 합니다. """
+        self._checked_at = 0.0
+
+    def _fingerprint(self, s: Session) -> Tuple:
+        stmt = select(
+            func.count(Text.id), # type: ignore
+            func.max(Text.id),
+            # 품사만 바뀌어도 tag_buckets를 다시 만들어야 하므로 tag도 포함 (구분자로 경계가 섞이지 않게 함)
+            func.sum(func.hashtext(
+                func.concat_ws("|", Text.name, Text.k_description, cast(Text.tag, String))
+            )), # type: ignore
+        )
+        return tuple(s.exec(stmt).one())
+
+    def _load(self, s: Session, version: Tuple) -> Vocabulary:
+        stmt = (
+            select(Text.id, Text.name, Text.tag, Text.k_description)
+            .order_by(Text.id) # type: ignore
+        )
+        rows = s.exec(stmt).all()
+        if not rows:
+            return Vocabulary([], [], [], [], version)
+
+        ids, names, tags, k_descriptions = zip(*rows)
+        return Vocabulary(ids, names, tags, k_descriptions, version)
+
+
+vocabulary = VocabularyCache()
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
@@ -5,13 +7,31 @@ from app.core.config import settings
 from app.routers import (
     paper_r, 
     result_r, 
-    user_r
+    user_r,
+    metrics_r,
 )
 from app.static import UIMiddleware
+from app.managers.pool import paper_pool
+from app.managers.stats import stats_buffer
+from app.core.security import password_worker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.PAPER_POOL_ENABLED:
+        paper_pool.start()
+    if settings.WORD_STATS_ENABLED:
+        stats_buffer.start()
+    yield
+    paper_pool.stop()
+    stats_buffer.stop()
+    password_worker.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -27,5 +47,6 @@ if settings.all_cors_origins:
 app.include_router(paper_r, prefix=f"{settings.API_V1_STR}/papers", tags=["papers"])
 app.include_router(result_r, prefix=f"{settings.API_V1_STR}/results", tags=["results"])
 app.include_router(user_r, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
+app.include_router(metrics_r, prefix=f"{settings.API_V1_STR}/metrics", tags=["metrics"])
 
 app.add_middleware(UIMiddleware)
\ No newline at end of file
@@ -1,42 +1,293 @@
-import random
-from sqlmodel import select, Session, values
-from typing import List, Optional
-from pydantic import BaseModel, Field
+import uuid
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlmodel import select, Session
 
 from app.schemas import (
-    PaperStore, 
-    User, 
-    Paper, 
-    Text
+    PaperStore,
+    User,
+    UType,
+    Tag,
+    Difficulty,
+    GetAnalyticsResponse,
+    StudentStat,
+    WordStat,
+    GroupStat,
+    ScoreDistribution,
 )
+from app.factory.codec import DIFFICULTY_CODES
+from app.factory.scoring import score_papers
+from app.factory.vocabulary import Vocabulary, vocabulary
+
+TAGS = list(Tag)
+
+
+class PaperColumns:
+    """
+    제출된 문제지 n장, 문제 m개를 열 단위 배열로 들고 있습니다.
+
+    문제지 단위 (길이 n): user_ids, scores
+    문제 단위 (길이 m): paper_index(몇번째 문제지), text_ids(정답 단어), difficulty(DIFFICULTY_CODES 코드), correct
+    """
+
+    def __init__(
+        self,
+        user_ids: np.ndarray,
+        scores: np.ndarray,
+        paper_index: np.ndarray,
+        text_ids: np.ndarray,
+        difficulty: np.ndarray,
+        correct: np.ndarray,
+    ) -> None:
+        self.user_ids = user_ids
+        self.scores = scores
+        self.paper_index = paper_index
+        self.text_ids = text_ids
+        self.difficulty = difficulty
+        self.correct = correct
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[Any, Optional[float], Dict]]) -> "PaperColumns":
+        """
+        (user_id, score, PaperStore.value) 행들을 한번만 훑어서 배열을 만듭니다.
+        Paper/Text 객체는 만들지 않습니다. (v1 문제지는 dict를 그대로 읽음)
+        score가 None인 행만 현재 가중치로 채점합니다. 가중치를 바꿨다면 app.data.rescore로 저장된 점수를 맞춰야 함
+        """
+        user_ids: List[str] = []
+        scores = array("d")
+        paper_index = array("q")
+        text_ids = array("q")
+        difficulty = array("b")
+        correct = array("b")
 
-class Evaluation(BaseModel):
-    score: int
-    total: int
-    percentage: float
+        for user_id, score, value in rows:
+            n = len(user_ids)
+            user_ids.append(str(user_id))
+            # 점수가 저장되지 않은 문제지는 NaN으로 두었다가 마지막에 한번에 채점
+            scores.append(score if score is not None else np.nan)
+
+            if value.get("v") is None:
+                for p in value["problems"]:
+                    answer = next(c for c in p["candidates"] if c["answer"])
+                    paper_index.append(n)
+                    text_ids.append(answer["text"]["id"])
+                    difficulty.append(DIFFICULTY_CODES.index(Difficulty(p["difficulty"])))
+                    correct.append(answer["checked"])
+                continue
+
+            for t, a, k, d in zip(value["t"], value["a"], value["k"], value["d"]):
+                paper_index.append(n)
+                text_ids.append(t[a])
+                difficulty.append(d)
+                correct.append(a == k)
+
+        columns = cls(
+            user_ids=np.array(user_ids, dtype=object),
+            scores=np.array(scores, dtype=np.float64),
+            paper_index=np.array(paper_index, dtype=np.int64),
+            text_ids=np.array(text_ids, dtype=np.int64),
+            difficulty=np.array(difficulty, dtype=np.int8),
+            correct=np.array(correct, dtype=bool),
+        )
+
+        missing = np.isnan(columns.scores)
+        if missing.any():
+            columns.scores[missing] = columns.rescore()[missing]
+        return columns
+
+    def rescore(self, weights: Optional[List[float]] = None) -> np.ndarray:
+        """ 저장된 점수 대신 문제별 정답 여부로 다시 채점합니다. (weights: 난이도 코드별 가중치) """
+        return score_papers(self.paper_index, self.difficulty, self.correct, len(self), weights)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+
+def _accuracy(correct: np.ndarray, asked: np.ndarray) -> np.ndarray:
+    return np.divide(correct, asked, out=np.zeros(len(asked)), where=asked > 0)
 
 
 class TestAnalyzer:
+    """
+    제출된 문제지를 열 단위로 모아서 반 전체 통계를 한번에 계산합니다.
+    문제지를 Paper로 하나씩 되살리지 않고, 모든 집계는 numpy로 처리합니다.
+    """
 
     def __init__(
         self,
         db_session: Session,
+        batch_size: int = 1000,
     ) -> None:
-        
+
         self.db_session = db_session
-    
-    def analyze(self, papers: List[Paper]):
-        """ 문제지의 시퀀스를 분석함 """
-        
-        for paper in papers:
-            owner = paper.get_owner_name()
-            score = paper.calculate_score()
-
-            print(f"{owner}의 점수는 {score}점 입니다.")
-        
-        return papers
-    
-    
-    def evaluate(self) -> Evaluation:
-        """ 학생을 평가함"""
-        return Evaluation()
\ No newline at end of file
+        self.batch_size = batch_size
+
+    def _rows(
+        self,
+        student_id: Optional[uuid.UUID],
+        since: Optional[datetime],
+        until: Optional[datetime],
+    ):
+        stmt = (
+            select(PaperStore.user_id, PaperStore.score, PaperStore.value)
+            .join(User, User.id == PaperStore.user_id) # type: ignore
+            .where(User.user_type == UType.STUDENT)
+            .where(PaperStore.submitted == True) # noqa: E712
+        )
+        if student_id is not None:
+            stmt = stmt.where(PaperStore.user_id == student_id)
+        if since is not None:
+            stmt = stmt.where(PaperStore.updated_at >= since)
+        if until is not None:
+            stmt = stmt.where(PaperStore.updated_at < until)
+
+        # 서버 커서로 batch_size 행씩 읽음 (dict는 배열로 옮긴 뒤 버려짐)
+        result = self.db_session.exec(stmt.execution_options(yield_per=self.batch_size)) # type: ignore
+        for rows in result.partitions():
+            yield from rows
+
+    def _names(self, user_ids: np.ndarray) -> Dict[str, str]:
+        stmt = select(User.id, User.user_name).where(User.id.in_([uuid.UUID(u) for u in user_ids])) # type: ignore
+        return {str(id): name for id, name in self.db_session.exec(stmt).all()}
+
+    def load(
+        self,
+        student_id: Optional[uuid.UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> PaperColumns:
+        return PaperColumns.from_rows(self._rows(student_id, since, until))
+
+    @staticmethod
+    def student_stats(columns: PaperColumns) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ 학생별 (user_id, 응시 수, 평균 점수) """
+        students, inverse = np.unique(columns.user_ids.astype(str), return_inverse=True)
+        papers = np.bincount(inverse, minlength=len(students))
+        totals = np.bincount(inverse, weights=columns.scores, minlength=len(students))
+        return students, papers, totals / np.maximum(papers, 1)
+
+    @staticmethod
+    def word_stats(columns: PaperColumns) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ 정답 단어별 (text_id, 출제 수, 틀린 수) """
+        words, inverse = np.unique(columns.text_ids, return_inverse=True)
+        asked = np.bincount(inverse, minlength=len(words))
+        wrong = np.bincount(inverse, weights=~columns.correct, minlength=len(words))
+        return words, asked, wrong.astype(np.int64)
+
+    @staticmethod
+    def difficulty_stats(columns: PaperColumns) -> Tuple[np.ndarray, np.ndarray]:
+        """ 난이도 코드별 (출제 수, 맞은 수) """
+        size = len(DIFFICULTY_CODES)
+        asked = np.bincount(columns.difficulty, minlength=size)
+        correct = np.bincount(columns.difficulty, weights=columns.correct, minlength=size)
+        return asked, correct.astype(np.int64)
+
+    @staticmethod
+    def tag_stats(
+        words: np.ndarray,
+        asked: np.ndarray,
+        wrong: np.ndarray,
+        vocab: Vocabulary
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """ 품사별 (출제 수, 맞은 수). 단어장에 없는(삭제된) 단어는 제외합니다. """
+        tag_codes = np.fromiter(
+            (
+                TAGS.index(vocab.tags[vocab.positions[w]]) if w in vocab.positions else -1
+                for w in words.tolist()
+            ),
+            dtype=np.int64,
+            count=len(words),
+        )
+        known = tag_codes >= 0
+        tag_asked = np.bincount(tag_codes[known], weights=asked[known], minlength=len(TAGS))
+        tag_wrong = np.bincount(tag_codes[known], weights=wrong[known], minlength=len(TAGS))
+        return tag_asked.astype(np.int64), (tag_asked - tag_wrong).astype(np.int64)
+
+    @staticmethod
+    def score_distribution(columns: PaperColumns, bins: int = 10) -> ScoreDistribution:
+        if len(columns) == 0:
+            return ScoreDistribution(mean=0, p50=0, p90=0, histogram=[0] * bins)
+
+        histogram, _ = np.histogram(columns.scores, bins=bins, range=(0, 100))
+        p50, p90 = np.percentile(columns.scores, [50, 90])
+        return ScoreDistribution(
+            mean=float(columns.scores.mean()),
+            p50=float(p50),
+            p90=float(p90),
+            histogram=histogram.tolist(),
+        )
+
+    def analyze(
+        self,
+        columns: PaperColumns,
+        vocab: Vocabulary,
+        names: Optional[Dict[str, str]] = None,
+        top_words: int = 50,
+        min_asked: int = 1,
+    ) -> GetAnalyticsResponse:
+        """
+        반 전체 통계를 계산합니다. (DB를 쓰지 않음)
+        names는 user_id -> 이름, words는 min_asked번 이상 출제된 단어 중 오답률이 높은 순서로 top_words개 입니다.
+        """
+        names = names or {}
+        students, papers, averages = self.student_stats(columns)
+
+        words, asked, wrong = self.word_stats(columns)
+        error_rate = _accuracy(wrong, asked)
+        candidates = np.flatnonzero(asked >= min_asked)
+        # 오답률 내림차순, 같으면 출제 수 내림차순
+        order = candidates[np.lexsort((-asked[candidates], -error_rate[candidates]))][:top_words]
+
+        difficulty_asked, difficulty_correct = self.difficulty_stats(columns)
+        difficulty_accuracy = _accuracy(difficulty_correct, difficulty_asked)
+
+        tag_asked, tag_correct = self.tag_stats(words, asked, wrong, vocab)
+        tag_accuracy = _accuracy(tag_correct, tag_asked)
+
+        return GetAnalyticsResponse(
+            paper_count=len(columns),
+            problem_count=len(columns.correct),
+            students=[
+                StudentStat(
+                    student_id=uuid.UUID(students[i]),
+                    user_name=names.get(students[i], ""),
+                    papers=int(papers[i]),
+                    average_score=float(averages[i]),
+                )
+                for i in np.argsort(-averages, kind="stable").tolist()
+            ],
+            words=[
+                WordStat(
+                    text_id=int(words[i]),
+                    name=vocab.names[vocab.positions[int(words[i])]] if int(words[i]) in vocab.positions else "",
+                    asked=int(asked[i]),
+                    wrong=int(wrong[i]),
+                    error_rate=float(error_rate[i]),
+                )
+                for i in order.tolist()
+            ],
+            tags=[
+                GroupStat(key=tag.value, asked=int(tag_asked[i]), accuracy=float(tag_accuracy[i]))
+                for i, tag in enumerate(TAGS) if tag_asked[i] > 0
+            ],
+            difficulties=[
+                GroupStat(key=d.value, asked=int(difficulty_asked[i]), accuracy=float(difficulty_accuracy[i]))
+                for i, d in enumerate(DIFFICULTY_CODES) if difficulty_asked[i] > 0
+            ],
+            scores=self.score_distribution(columns),
+        )
+
+    def run(
+        self,
+        student_id: Optional[uuid.UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        top_words: int = 50,
+        min_asked: int = 1,
+    ) -> GetAnalyticsResponse:
+        columns = self.load(student_id, since, until)
+        names = self._names(np.unique(columns.user_ids.astype(str))) if len(columns) else {}
+        return self.analyze(columns, vocabulary.get(), names, top_words, min_asked)
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.cursor import encode_cursor
+from app.core.db import async_engine
+from app.schemas import PaperStore, ExportFormat
+
+# PaperStore._export_stmt 의 컬럼 순서 + 이어받기용 cursor
+COLUMNS = (
+    "student_id",
+    "user_name",
+    "name",
+    "paper_id",
+    "test_id",
+    "score",
+    "problem_count",
+    "created_at",
+    "updated_at",
+    "cursor",
+)
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _plain(value):
+    """ JSON/CSV로 바로 쓸 수 있는 값으로 바꿉니다. """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+class ResultExporter:
+    """
+    학생들의 제출 결과를 NDJSON / CSV 로 스트리밍합니다.
+    행마다 cursor가 붙어있어서 다운로드가 끊기면 마지막으로 받은 행의 cursor로 이어받을 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        export_format: ExportFormat = ExportFormat.NDJSON,
+        batch_size: int = settings.EXPORT_BATCH_SIZE,
+    ) -> None:
+        self.export_format = export_format
+        self.batch_size = batch_size
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.export_format]
+
+    def _encode(self, rows: List, header: bool) -> bytes:
+        records = [
+            [_plain(v) for v in row] + [encode_cursor(row.updated_at, row.key)]
+            for row in rows
+        ]
+
+        if self.export_format == ExportFormat.NDJSON:
+            lines = (json.dumps(dict(zip(COLUMNS, r)), ensure_ascii=False) for r in records)
+            return ("\n".join(lines) + "\n").encode()
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(COLUMNS)
+        writer.writerows(records)
+        return buffer.getvalue().encode()
+
+    async def stream(
+        self,
+        student_id: Optional[uuid.UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        StreamingResponse 가 이 제너레이터를 도는 시점에는 요청의 DB 세션(Depends)이 이미 닫혀있으므로
+        세션을 직접 엽니다.
+        """
+        header = True
+        async with AsyncSession(async_engine) as s:
+            async for rows in PaperStore.aexport(
+                s, student_id, since, until, limit, cursor, batch_size=self.batch_size
+            ):
+                yield self._encode(rows, header)
+                header = False
+
+        # 결과가 하나도 없어도 CSV는 헤더를 보냄
+        if header and self.export_format == ExportFormat.CSV:
+            yield self._encode([], header)
@@ -0,0 +1,119 @@
+import threading
+import uuid
+from collections import deque
+from typing import Callable, Deque, Optional
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.schemas.enum import SamplingMode
+from app.factory.problem import Exportation, ProblemFactory
+from app.factory.adaptive import UserWeights, load_user_weights
+from app.factory.vocabulary import vocabulary
+
+
+def make_exportation(
+    weights: Optional[UserWeights] = None,
+    problems_count: int = settings.PAPER_PROBLEMS_DEFAULT,
+    candidate_limit: int = settings.PAPER_CANDIDATES_DEFAULT,
+) -> Optional[Exportation]:
+    with Session(engine) as s:
+        at_factory = ProblemFactory(
+            db_session=s,
+            candidate_limit=candidate_limit,
+            problems_count=problems_count,
+            sampling=SamplingMode(settings.PROBLEM_SAMPLING_MODE),
+            weights=weights,
+        )
+        return at_factory.run_pipeline()
+
+
+def user_weights(user_id: uuid.UUID) -> Optional[UserWeights]:
+    """
+    적응형 출제를 할 만큼 기록이 있으면 유저의 가중치를, 아니면 None을 리턴합니다.
+    적응형 출제가 꺼져있거나 DATABASE 모드이면 단어장을 읽지 않고 None 입니다.
+    """
+    if not settings.adaptive_enabled:
+        return None
+
+    with Session(engine) as s:
+        return load_user_weights(s, user_id, vocabulary.get())
+
+
+class PaperPool:
+    """
+    미리 만들어둔 문제지(Exportation)를 담아두는 풀입니다.
+    남은 개수가 low_watermark 아래로 내려가면 백그라운드 스레드가 high_watermark까지 채웁니다.
+    요청 처리 쪽에서는 take()로 꺼내서 유저에게 바인딩만 하면 됩니다.
+    """
+
+    def __init__(
+        self,
+        low_watermark: int = settings.PAPER_POOL_LOW_WATERMARK,
+        high_watermark: int = settings.PAPER_POOL_HIGH_WATERMARK,
+        make: Callable[[], Optional[Exportation]] = make_exportation,
+        retry_seconds: float = 5.0,
+    ) -> None:
+        if low_watermark > high_watermark:
+            raise ValueError('low_watermark는 high_watermark보다 클 수 없습니다.')
+
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.make = make
+        self.retry_seconds = retry_seconds
+
+        self._papers: Deque[Exportation] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._papers)
+
+    def take(self) -> Optional[Exportation]:
+        """ 풀이 비어있으면 None을 리턴하고, 호출한 쪽에서 직접 만들어야 합니다. """
+        try:
+            imported = self._papers.popleft()
+        except IndexError:
+            imported = None
+
+        if len(self._papers) < self.low_watermark:
+            self._wake.set()
+
+        return imported
+
+    def start(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        self._stop.clear()
+        self._wake.set()
+        self._worker = threading.Thread(target=self._run, name="paper-pool", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=self.retry_seconds)
+            self._worker = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+
+            while not self._stop.is_set() and len(self._papers) < self.high_watermark:
+                try:
+                    imported = self.make()
+                except Exception as e:
+                    print("문제지 풀을 채우는중 오류남: ", e)
+                    self._stop.wait(self.retry_seconds)
+                    continue
+
+                if imported is not None:
+                    self._papers.append(imported)
+
+
+paper_pool = PaperPool()
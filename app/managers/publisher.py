@@ -1,8 +1,8 @@
 import uuid
-from typing import List
-from datetime import datetime
+from typing import List, Optional
 
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.schemas import (
     Paper, 
     UserDTO, 
@@ -11,7 +11,11 @@ from app.schemas import (
     StoreSearchOption,
     PaperMeta
 )
-from app.factory.problem import ProblemFactory
+from app.factory.problem import ProblemFactory, Exportation
+from app.factory.codec import decode_paper
+from app.factory.adaptive import load_user_weights
+from app.factory.vocabulary import vocabulary
+from app.core.config import settings
 
 class Publisher:
     
@@ -25,13 +29,21 @@ class Publisher:
         self.request_key = request_key
         self.target_user = target_user
 
-    def same_time(self, dt1: datetime, dt2: datetime) -> bool:
-        return abs((dt1 - dt2).total_seconds()) < 1
-
     def publish_paper(self, problem_factory: ProblemFactory) -> Paper:
+        # 기록이 충분한 유저에게는 많이 틀린 단어가 다시 나오도록 출제
+        if settings.adaptive_enabled and problem_factory.weights is None:
+            problem_factory.adapt(
+                load_user_weights(problem_factory.db_session, self.target_user.id, vocabulary.get())
+            )
+
         imported = problem_factory.run_pipeline()
         if imported is None:
             raise ValueError("problem을 생성하는데 문제가 발생함")
+        
+        return self.bind(imported)
+    
+    def bind(self, imported: Exportation) -> Paper:
+        """ 이미 만들어진 문제들(문제지 풀 등)을 target_user에게 바인딩합니다. """
         self.imported = imported
         
         return Paper(
@@ -40,32 +52,51 @@ class Publisher:
             problems=self.imported.problems
         )
     
-    def get_papers_by_user(self, db: Session, user: User, option: StoreSearchOption = StoreSearchOption.ALL) -> List[Paper] | List[PaperStore] | List[PaperMeta]:
-        """ 같은 학생이 푼 서로다른 문제지들을 가져옴 """
+    def get_papers_by_user(
+        self, 
+        db: Session, 
+        user: User, 
+        option: StoreSearchOption = StoreSearchOption.ALL,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Paper] | List[PaperStore] | List[PaperMeta]:
+        """ 같은 학생이 푼 서로다른 문제지들을 최신순으로 가져옴 """
 
         namespace = (user.id,)
-        papers = PaperStore.search(db, namespace, option) # type: ignore
 
-        right_papers = []
-        
-        ## 제출된 문제지만 가져옴
-        match option:
-            case StoreSearchOption.ALL:
-                
-                for paper in papers:
-                    if self.same_time(paper.created_at, paper.updated_at) is False:                        
-                        right_papers.append(paper)
-            
-            case StoreSearchOption.META:
+        ## 제출된 문제지만 가져옴 (VALUE는 제출여부와 상관없이 가져옴)
+        submitted = None if option == StoreSearchOption.VALUE else True
 
-                for paper in papers:
-                    if self.same_time(paper.created_at, paper.updated_at) is False:
-                        right_papers.append(paper)
-            
-            case StoreSearchOption.VALUE:
-                right_papers = papers
-        
-        return right_papers
+        return PaperStore.search(
+            db, 
+            namespace, # type: ignore
+            option, 
+            submitted=submitted, 
+            limit=limit, 
+            cursor=cursor
+        )
+
+    async def aget_papers_by_user(
+        self, 
+        db: AsyncSession, 
+        user: User, 
+        option: StoreSearchOption = StoreSearchOption.ALL,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Paper] | List[PaperStore] | List[PaperMeta]:
+        """ get_papers_by_user의 async 버전 """
+
+        namespace = (user.id,)
+        submitted = None if option == StoreSearchOption.VALUE else True
+
+        return await PaperStore.asearch(
+            db, 
+            namespace, # type: ignore
+            option, 
+            submitted=submitted, 
+            limit=limit, 
+            cursor=cursor
+        )
 
     def get_papers_by_paper(self, db: Session, paper: Paper) -> List[Paper]:
         """ 같은 문제지들을 가져옴"""
@@ -79,9 +110,6 @@ class Publisher:
         
         same_papers = []
         for paper in papers: # type: ignore
-            casted = Paper.model_validate(paper)
-            casted.model_validate_to_end()
-
-            same_papers.append(casted)
+            same_papers.append(decode_paper(paper))
 
         return same_papers
\ No newline at end of file
@@ -0,0 +1,102 @@
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.schemas.stats import Counter, add_counters
+
+
+def _merge(counters: Dict, key, counter: Counter) -> None:
+    shown, correct, seen = counter
+    old_shown, old_correct, old_seen = counters.get(key, (0, 0, seen))
+    counters[key] = (old_shown + shown, old_correct + correct, max(old_seen, seen))
+
+
+class StatsBuffer:
+    """
+    제출 결과의 단어별 카운터를 메모리에 모아두었다가 백그라운드 스레드가 한번에 DB에 더합니다.
+    flush_seconds마다, 혹은 모인 키가 max_pending개를 넘으면 바로 flush 합니다.
+    프로세스가 비정상 종료되면 flush 되지 않은 카운터는 사라집니다. (통계용이므로 허용)
+    """
+
+    def __init__(
+        self,
+        flush_seconds: float = settings.WORD_STATS_FLUSH_SECONDS,
+        max_pending: int = settings.WORD_STATS_MAX_PENDING,
+    ) -> None:
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._texts: Dict[int, Counter] = {}
+        self._users: Dict[Tuple[uuid.UUID, int], Counter] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def record(self, user_id: uuid.UUID, results: List[Tuple[int, bool]]) -> None:
+        """ 한 문제지의 (정답 단어 text_id, 맞았는지) 목록을 더합니다. """
+        now = datetime.now()
+        with self._lock:
+            for text_id, correct in results:
+                counter = (1, int(correct), now)
+                _merge(self._texts, text_id, counter)
+                _merge(self._users, (user_id, text_id), counter)
+
+        if len(self._users) >= self.max_pending:
+            self._wake.set()
+
+    def _swap(self) -> Tuple[Dict[int, Counter], Dict[Tuple[uuid.UUID, int], Counter]]:
+        with self._lock:
+            texts, users = self._texts, self._users
+            self._texts, self._users = {}, {}
+        return texts, users
+
+    def flush(self) -> None:
+        texts, users = self._swap()
+        if not texts:
+            return
+
+        try:
+            with Session(engine) as s:
+                add_counters(s, texts, users)
+        except Exception as e:
+            print("단어 통계를 저장하는중 오류남: ", e)
+            # 다음 flush에서 다시 시도하도록 되돌려놓음
+            with self._lock:
+                for key, counter in texts.items():
+                    _merge(self._texts, key, counter)
+                for key, counter in users.items():
+                    _merge(self._users, key, counter)
+
+    def start(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="word-stats", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=self.flush_seconds)
+            self._worker = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+
+stats_buffer = StatsBuffer()
@@ -1,9 +1,11 @@
 from .paper import paper_r
 from .result import result_r
 from .user import user_r
+from .metrics import metrics_r
 
 __all__ = [
     'paper_r', 
     'result_r', 
-    'user_r'
+    'user_r',
+    'metrics_r',
 ]
\ No newline at end of file
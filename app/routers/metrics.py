@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi import HTTPException, Depends
+
+from app.core.db import pool_metrics
+from app.core.cache import user_cache, token_cache
+from app.schemas import (
+    User,
+    UType,
+    GetMetricsResponse
+)
+from app.deps import get_current_user
+
+metrics_r = APIRouter()
+
+@metrics_r.get("", response_model=GetMetricsResponse)
+async def get_metrics(me: User = Depends(get_current_user)):
+
+    if me.user_type != UType.ADMIN:
+        raise HTTPException(status_code=403, detail="You are not an admin")
+
+    return GetMetricsResponse(
+        pools=pool_metrics(), # type: ignore
+        caches={
+            "user": user_cache.stats(),
+            "token": token_cache.stats(),
+        } # type: ignore
+    )
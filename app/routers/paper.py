@@ -1,6 +1,8 @@
 import uuid
+from typing import Annotated, Dict, List, Tuple
 from fastapi import APIRouter
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 
 from app.schemas import (
     UserDTO,
@@ -9,20 +11,37 @@ from app.schemas import (
     PostSubmitResponse,
     TestPaper,
     PaperStore,
-    Paper
+    UType,
+    SubmitResult,
+    PostBatchSubmitResponse,
 )
 from app.deps import (
-    Session, 
-    get_db, 
+    AsyncSession, 
+    get_async_db, 
     get_current_user
 )
-from app.factory.problem import ProblemFactory
+from app.core.config import settings
+from app.core.responses import fast_response
 from app.managers.publisher import Publisher
+from app.factory.codec import PaperView, encode_paper
+from app.managers.pool import paper_pool, make_exportation, user_weights
+from app.managers.stats import stats_buffer
 
 paper_r = APIRouter()
 
+ProblemsQuery = Annotated[int, Query(ge=1, le=settings.PAPER_PROBLEMS_MAX)]
+CandidatesQuery = Annotated[int, Query(ge=2, le=settings.PAPER_CANDIDATES_MAX)]
+
+
 @paper_r.get("/paper", response_model=GetTestPaperResponse)
-async def get_paper(me: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_paper(
+    request: Request,
+    problems_count: ProblemsQuery = settings.PAPER_PROBLEMS_DEFAULT,
+    candidate_limit: CandidatesQuery = settings.PAPER_CANDIDATES_DEFAULT,
+    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """ problems_count, candidate_limit로 문제 수와 보기 수를 정할 수 있습니다. (배치고사용 200문제 등) """
     
     this_user = UserDTO(
         id=me.id, 
@@ -30,48 +49,145 @@ async def get_paper(me: User = Depends(get_current_user), db: Session = Depends(
         user_name=me.user_name,
         user_nickname=me.user_nickname,
     )
-    at_factory = ProblemFactory(db_session=db)
-    published_version = (
-        Publisher(target_user=this_user)
-        .publish_paper(at_factory)   
+    publisher = Publisher(target_user=this_user)
+
+    # 기록이 충분한 유저는 유저별 문제지가 필요하므로 풀을 쓰지 않음
+    weights = await run_in_threadpool(user_weights, me.id) if settings.adaptive_enabled else None
+
+    # 풀에 미리 만들어둔 문제지가 있으면 바인딩만 하고, 없으면 직접 만듦 (풀에는 기본 크기의 문제지만 있음)
+    default_size = (
+        problems_count == settings.PAPER_PROBLEMS_DEFAULT
+        and candidate_limit == settings.PAPER_CANDIDATES_DEFAULT
     )
+    use_pool = settings.PAPER_POOL_ENABLED and weights is None and default_size
+    imported = paper_pool.take() if use_pool else None
+    if imported is None:
+        # 문제 생성은 동기 DB 세션을 쓰므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        try:
+            imported = await run_in_threadpool(make_exportation, weights, problems_count, candidate_limit)
+        except ValueError:
+            # 단어장이 요청한 크기의 문제지를 만들기에 모자람
+            raise HTTPException(status_code=400, detail="Not enough words for the requested paper size")
+    if imported is None:
+        raise HTTPException(status_code=500, detail="Failed to create a paper")
+
+    published_version = publisher.bind(imported)
     test_version = published_version.to_test_version(test_id=uuid.uuid4())
 
     namespace = (published_version.binded.id, published_version.id)
-    PaperStore.put(
+    await PaperStore.aput(
         db, 
         namespace, 
         str(test_version.test_id),
-        published_version.model_dump(mode="json")
+        encode_paper(published_version),
+        problem_count=published_version.get_p_counts(),
     )
 
-    return GetTestPaperResponse(paper = test_version)
+    return fast_response(request, GetTestPaperResponse(paper = test_version))
 
 
 @paper_r.post("/submit", response_model=PostSubmitResponse)
-async def submit_paper(test_paper: TestPaper, me: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def submit_paper(request: Request, test_paper: TestPaper, me: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
  
+    # 학생은 자기 문제지만 제출할 수 있음 (/submit/batch 와 같은 규칙)
+    if test_paper.binded.id != me.id and me.user_type not in [UType.TEACHER, UType.ADMIN]:
+        raise HTTPException(status_code=403, detail="Not your paper")
+
     namespace = (test_paper.binded.id, test_paper.paper_id)
     
-    paper_json = PaperStore.get(db, namespace, test_paper.test_id) # type: ignore
-    to_published_version = (
-        Paper
-        .model_validate(paper_json)
-        .model_validate_to_end()
-    )
-    changed_paper = test_paper.apply_changes(to_published_version)
+    stored = await PaperStore.aget_submission(db, namespace, test_paper.test_id) # type: ignore
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    paper_json, _ = stored
 
+    # 채점에는 단어가 필요 없으므로 Paper를 만들지 않고 저장된 값 위에서 바로 처리
+    changed_paper = PaperView(paper_json).set_checked(test_paper.checked_map())
+    score = changed_paper.calculate_score()
     
-    PaperStore.put(
+    first_submit = await PaperStore.asubmit(
         db, 
         namespace, 
         str(test_paper.test_id),
-        changed_paper.model_dump(mode="json")
+        changed_paper.to_value(),
+        score=score,
+        problem_count=changed_paper.get_p_counts(),
     )
 
-    score = changed_paper.calculate_score()
+    # 다시 제출한 경우 같은 문제지가 두번 세어지지 않도록 첫 제출만 통계에 반영
+    # (처음 제출인지는 저장할때 submitted를 바꾼 쪽이 정하므로 동시에 제출해도 한번만 셈)
+    if settings.WORD_STATS_ENABLED and first_submit:
+        stats_buffer.record(namespace[0], changed_paper.answer_results())
 
-    return PostSubmitResponse(
-        score=score,
-        user=changed_paper.binded
-    )
\ No newline at end of file
+    return fast_response(
+        request,
+        PostSubmitResponse(
+            score=score,
+            user=changed_paper.binded
+        )
+    )
+
+
+@paper_r.post("/submit/batch", response_model=PostBatchSubmitResponse)
+async def submit_papers(request: Request, test_papers: List[TestPaper], me: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    """
+    오프라인에서 모아둔 제출을 한번에 처리합니다.
+    문제지는 한 번의 쿼리로 읽고, 메모리에서 채점한 뒤 한 번의 upsert로 저장합니다.
+    결과는 요청 순서대로 문제지마다 성공/실패가 따로 담깁니다.
+    같은 test_id가 여러번 있으면 순서대로 덮어써서 마지막 제출이 저장됩니다.
+    """
+    if len(test_papers) > settings.SUBMIT_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Too many papers (max {settings.SUBMIT_BATCH_MAX})")
+
+    is_teacher = me.user_type in [UType.TEACHER, UType.ADMIN]
+    stored = await PaperStore.aget_submissions(
+        db, [((tp.binded.id, tp.paper_id), tp.test_id) for tp in test_papers]
+    )
+
+    views: Dict[Tuple[str, str], PaperView] = {}
+    writes: Dict[Tuple[str, str], tuple] = {}
+    results: List[SubmitResult] = []
+    for tp in test_papers:
+        namespace = (tp.binded.id, tp.paper_id)
+        key = (".".join(map(str, namespace)), str(tp.test_id))
+
+        if tp.binded.id != me.id and not is_teacher:
+            results.append(SubmitResult(test_id=tp.test_id, ok=False, error="Not your paper"))
+            continue
+        if key not in stored:
+            results.append(SubmitResult(test_id=tp.test_id, ok=False, error="Paper not found"))
+            continue
+
+        try:
+            view = views.get(key) or PaperView(stored[key][0])
+            view.set_checked(tp.checked_map())
+            score = view.calculate_score()
+        except (ValueError, KeyError, IndexError) as e:
+            results.append(SubmitResult(test_id=tp.test_id, ok=False, error=f"Invalid paper: {e}"))
+            continue
+
+        views[key] = view
+        writes[key] = (
+            namespace,
+            tp.test_id,
+            view.to_value(),
+            dict(score=score, submitted=True, problem_count=view.get_p_counts()),
+        )
+        results.append(SubmitResult(test_id=tp.test_id, ok=True, score=score))
+
+    try:
+        first_submits = await PaperStore.asubmit_many(db, list(writes.values()))
+    except Exception as e:
+        print("문제지 일괄 제출을 저장하는중 오류남: ", e)
+        results = [
+            r if not r.ok else SubmitResult(test_id=r.test_id, ok=False, error="Failed to save")
+            for r in results
+        ]
+        return fast_response(request, PostBatchSubmitResponse(results=results))
+
+    if settings.WORD_STATS_ENABLED:
+        for key, (namespace, _, _, _) in writes.items():
+            # 처음 제출되는 문제지만 통계에 반영 (단일 제출과 같은 규칙)
+            if key in first_submits:
+                stats_buffer.record(namespace[0], views[key].answer_results())
+
+    return fast_response(request, PostBatchSubmitResponse(results=results))
@@ -1,10 +1,20 @@
 import uuid
 from datetime import datetime
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from fastapi import APIRouter
-from fastapi import HTTPException, Depends, Query
+from fastapi import HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
+from sqlmodel import Session
+
+from app.core.cursor import encode_cursor, decode_cursor
+from app.core.db import engine
+from app.core.responses import fast_response
 from app.managers.publisher import Publisher
+from app.managers.exporter import ResultExporter
+from app.managers.analyzer import TestAnalyzer
+from app.factory.codec import decode_paper
 from app.schemas import (
     PaperStore, 
     User,
@@ -15,126 +25,211 @@ from app.schemas import (
     GetPaperResponse,
     GetResultResponse,
     StoreSearchOption,
+    ExportFormat,
+    GetAnalyticsResponse,
+    GetWordStatsResponse,
+    WordStat,
+    TextStat,
+    UserTextStat,
 )
 
-from app.deps import Session, get_db, get_current_user
+from app.deps import AsyncSession, get_async_db, get_current_user
 
 result_r = APIRouter()
 
+LimitQuery = Annotated[Optional[int], Query(ge=1, le=500)]
+CursorQuery = Annotated[Optional[str], Query()]
+
+
+async def _result_page(db: AsyncSession, user: User, limit: Optional[int], cursor: Optional[str]) -> GetResultResponse:
+    """ 제출된 문제지의 메타정보를 최신순으로 한 페이지 가져옵니다. """
+    try:
+        meta: List[PaperMeta] = await Publisher().aget_papers_by_user(
+            db, user, option=StoreSearchOption.META, limit=limit, cursor=cursor
+        ) # type: ignore
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    next_cursor = None
+    if limit is not None and len(meta) == limit:
+        next_cursor = encode_cursor(meta[-1].updated_at, meta[-1].test_id)
+
+    return GetResultResponse(papers=meta, next_cursor=next_cursor)
+
+async def _load_paper(db: AsyncSession, namespace: tuple, test_id: uuid.UUID) -> Paper:
+    value = await PaperStore.aget(db, namespace, test_id)
+    if value is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+
+    # 단어장 캐시가 오래됐으면 DB를 확인하므로 스레드에서 실행
+    return await run_in_threadpool(decode_paper, value)
+
 @result_r.get("/specific/me", response_model=GetPaperResponse)
 async def get_my_result_of_paper(
+    request: Request,
     paper_id: Annotated[uuid.UUID, Query()],
     test_id: Annotated[uuid.UUID, Query()],
     me: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     namespace = (me.id, paper_id)
     
-    return GetPaperResponse(
-        paper=(
-            Paper
-            .model_validate(
-                PaperStore.get(db, namespace, test_id)
-            )
-            .model_validate_to_end()
-        ) # type: ignore
-    )
+    paper = await _load_paper(db, namespace, test_id)
+    return fast_response(request, GetPaperResponse(paper=paper))
 
 @result_r.get("/specific", response_model=GetPaperResponse)
 async def get_result_of_paper_of(
+    request: Request,
     student_id: Annotated[uuid.UUID, Query()],
     paper_id: Annotated[uuid.UUID, Query()],
     test_id: Annotated[uuid.UUID, Query()],
     me: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     namespace = (student_id, paper_id)
     
-    return GetPaperResponse(
-        paper=(
-            Paper
-            .model_validate(
-                PaperStore.get(db, namespace, test_id)
-            )
-            .model_validate_to_end()
-        ) # type: ignore
-    )
+    paper = await _load_paper(db, namespace, test_id)
+    return fast_response(request, GetPaperResponse(paper=paper))
 
 
 @result_r.get("/meta/me", response_model=GetResultResponse)
 async def get_my_result_only_meta(
+    request: Request,
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
     me: User = Depends(get_current_user), 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    
-    publisher = Publisher()
-    papers = publisher.get_papers_by_user(db, me, option=StoreSearchOption.ALL)
-
-    meta = []
-    for paper in papers:
-
-        target = paper.value
-        target_paper =(
-            Paper
-            .model_validate(target)
-            .model_validate_to_end()
-        )
-
-        score = target_paper.calculate_score()
-        
-        meta.append(
-            PaperMeta(
-                paper_id=paper.prefix.split(".")[-1],
-                test_id=paper.key,
-                created_at=paper.created_at if paper.created_at is not None else datetime.now(),
-                updated_at=paper.updated_at if paper.updated_at is not None else datetime.now(),
-                score=score
-            )
-        )
-
-    return GetResultResponse(
-        papers=meta # type: ignore
-    )
+    return fast_response(request, await _result_page(db, me, limit, cursor))
 
 
 @result_r.get("/meta/all", response_model=GetResultResponse)
 async def get_student_result_only_meta(
+    request: Request,
     student_id: Annotated[uuid.UUID, Query()], 
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
     my: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if my.user_type not in [UType.TEACHER, UType.ADMIN]:
         raise HTTPException(status_code=403, detail="You are not a teacher")
     
-    student = User.get_by_id(db, student_id)
+    student = await User.aget_by_id(db, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    publisher = Publisher()
-    papers: List[PaperStore] = publisher.get_papers_by_user(db, student, option=StoreSearchOption.ALL)
-    
-    meta = []
-    for paper in papers:
-
-        target = paper.value
-        target_paper =(
-            Paper
-            .model_validate(target)
-            .model_validate_to_end()
-        )
-
-        score = target_paper.calculate_score()
-        
-        meta.append(
-            PaperMeta(
-                paper_id=paper.prefix.split(".")[-1],
-                test_id=paper.key,
-                created_at=paper.created_at if paper.created_at is not None else datetime.now(),
-                updated_at=paper.updated_at if paper.updated_at is not None else datetime.now(),
-                score=score
+    return fast_response(request, await _result_page(db, student, limit, cursor))
+
+
+@result_r.get("/export")
+async def export_results(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+    student_id: Annotated[Optional[uuid.UUID], Query()] = None,
+    since: Annotated[Optional[datetime], Query()] = None,
+    until: Annotated[Optional[datetime], Query()] = None,
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+    cursor: CursorQuery = None,
+    my: User = Depends(get_current_user),
+):
+    """ 
+    학생들의 제출 결과를 최신순으로 스트리밍합니다. (student_id가 없으면 전체 학생)
+    각 행의 cursor를 다음 요청의 cursor로 넘기면 그 다음 행부터 이어서 받습니다.
+    """
+    if my.user_type not in [UType.TEACHER, UType.ADMIN]:
+        raise HTTPException(status_code=403, detail="You are not a teacher")
+
+    # 스트리밍을 시작한 뒤에는 상태코드를 바꿀 수 없으므로 미리 확인
+    if cursor is not None:
+        try:
+            updated_at, _ = decode_cursor(cursor, 2)
+            datetime.fromisoformat(updated_at)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    exporter = ResultExporter(export_format)
+    return StreamingResponse(
+        exporter.stream(student_id, since, until, limit, cursor),
+        media_type=exporter.media_type,
+        headers={
+            "content-disposition": f'attachment; filename="results.{export_format.value}"',
+        },
+    )
+
+
+def _analyze(
+    student_id: Optional[uuid.UUID],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    top_words: int,
+    min_asked: int,
+) -> GetAnalyticsResponse:
+    with Session(engine) as s:
+        return TestAnalyzer(s).run(student_id, since, until, top_words, min_asked)
+
+
+@result_r.get("/analytics", response_model=GetAnalyticsResponse)
+async def get_analytics(
+    request: Request,
+    student_id: Annotated[Optional[uuid.UUID], Query()] = None,
+    since: Annotated[Optional[datetime], Query()] = None,
+    until: Annotated[Optional[datetime], Query()] = None,
+    top_words: Annotated[int, Query(ge=1, le=500)] = 50,
+    min_asked: Annotated[int, Query(ge=1)] = 1,
+    my: User = Depends(get_current_user),
+):
+    """ 학생들의 제출 결과로 학생별 평균, 단어별 오답률, 품사/난이도별 정답률, 점수 분포를 계산합니다. """
+    if my.user_type not in [UType.TEACHER, UType.ADMIN]:
+        raise HTTPException(status_code=403, detail="You are not a teacher")
+
+    # 집계는 CPU를 쓰고 동기 세션으로 서버 커서를 읽으므로 스레드에서 실행
+    analytics = await run_in_threadpool(_analyze, student_id, since, until, top_words, min_asked)
+    return fast_response(request, analytics)
+
+
+def _word_stats(rows: List) -> GetWordStatsResponse:
+    return GetWordStatsResponse(
+        words=[
+            WordStat(
+                text_id=text_id,
+                name=name,
+                asked=shown,
+                wrong=shown - correct,
+                error_rate=error_rate,
             )
-        )
+            for text_id, name, shown, correct, error_rate in rows
+        ]
+    )
+
+
+@result_r.get("/words/me", response_model=GetWordStatsResponse)
+async def get_my_word_stats(
+    request: Request,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    min_shown: Annotated[int, Query(ge=1)] = 1,
+    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """ 내가 많이 틀린 단어 (제출할때마다 누적된 통계에서 바로 읽음) """
+    rows = await UserTextStat.ahardest(db, me.id, limit, min_shown)
+    return fast_response(request, _word_stats(rows))
+
+
+@result_r.get("/words", response_model=GetWordStatsResponse)
+async def get_word_stats(
+    request: Request,
+    student_id: Annotated[Optional[uuid.UUID], Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    min_shown: Annotated[int, Query(ge=1)] = 1,
+    my: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """ 전체(혹은 student_id 학생)가 많이 틀린 단어 """
+    if my.user_type not in [UType.TEACHER, UType.ADMIN]:
+        raise HTTPException(status_code=403, detail="You are not a teacher")
 
-    return GetResultResponse(
-        papers=meta # type: ignore
-    )
\ No newline at end of file
+    if student_id is None:
+        rows = await TextStat.ahardest(db, limit, min_shown)
+    else:
+        rows = await UserTextStat.ahardest(db, student_id, limit, min_shown)
+    return fast_response(request, _word_stats(rows))
@@ -1,6 +1,6 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import APIRouter
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Query
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.schemas import (
@@ -11,18 +11,23 @@ from app.schemas import (
     UType,
     GetStudentsResponse
 )
+from app.core.security import HashingBusy
+from app.core.cursor import encode_cursor
 from app.deps import (
-    Session, 
-    get_db, 
+    AsyncSession, 
+    get_async_db, 
     get_current_user
 )
 
 user_r = APIRouter()
 
 @user_r.post("/sign_up", response_model=UserDTO)
-async def sign_up(new_user: UserCreate, db: Session = Depends(get_db)):
+async def sign_up(new_user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     
-    created = User.create(db, user=new_user)
+    try:
+        created = await User.acreate(db, user=new_user)
+    except HashingBusy:
+        raise HTTPException(status_code=503, detail="Too many requests", headers={"Retry-After": "1"})
     if created:
         return UserDTO(
             id=created.id, 
@@ -35,14 +40,19 @@ async def sign_up(new_user: UserCreate, db: Session = Depends(get_db)):
     raise HTTPException(status_code=500, detail="User already exists")
 
 @user_r.post("/sign_in", response_model=Token)
-async def sign_in(user: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_db)):
+async def sign_in(user: Annotated[OAuth2PasswordRequestForm, Depends()], db: AsyncSession = Depends(get_async_db)):
     
-    me = User.get(db, user.username)
+    me = await User.aget(db, user.username)
 
     if not me:
         raise HTTPException(status_code=500, detail="User not found")
     
-    if me.verify(user.password):
+    try:
+        verified = await me.averify(user.password)
+    except HashingBusy:
+        raise HTTPException(status_code=503, detail="Too many requests", headers={"Retry-After": "1"})
+
+    if verified:
         token = Token.new(me)
         return token
     else:
@@ -61,23 +71,27 @@ async def get_me(me: User = Depends(get_current_user)):
 
 
 @user_r.get("/students", response_model=GetStudentsResponse)
-async def get_students(me: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_students(
+    name_prefix: Annotated[Optional[str], Query(max_length=100)] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=500)] = None,
+    cursor: Annotated[Optional[str], Query()] = None,
+    me: User = Depends(get_current_user), 
+    db: AsyncSession = Depends(get_async_db)
+):
         
     if me.user_type not in [UType.TEACHER, UType.ADMIN]:
         raise HTTPException(status_code=403, detail="You are not a teacher")
     
-    all_user = User.get_all(db)
-    if not all_user:
+    try:
+        students = await User.aget_students(db, name_prefix, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not students and cursor is None:
         raise HTTPException(status_code=404, detail="No student found")
     
-    return GetStudentsResponse(
-        students=[
-            UserDTO(
-                id=each.id, 
-                name=each.name,
-                user_name=each.user_name,
-                user_nickname=each.user_nickname,
-            ) 
-            for each in all_user if each.user_type == UType.STUDENT
-        ]
-    )
+    next_cursor = None
+    if limit is not None and len(students) == limit:
+        next_cursor = encode_cursor(students[-1].user_name, students[-1].id)
+
+    return GetStudentsResponse(students=students, next_cursor=next_cursor)
@@ -17,6 +17,10 @@ from .test_paper import (
     PaperStore,
     PaperMeta
 )
+from .stats import (
+    TextStat,
+    UserTextStat,
+)
 from .enum import (
     UType,
     QType,
@@ -24,6 +28,8 @@ from .enum import (
     Tag,
     APIStatus,
     StoreSearchOption,
+    SamplingMode,
+    ExportFormat,
 )
 from .api import (
     GetPaperResponse,
@@ -31,6 +37,15 @@ from .api import (
     GetResultResponse,
     GetStudentsResponse,
     GetTestPaperResponse,
+    GetMetricsResponse,
+    GetAnalyticsResponse,
+    StudentStat,
+    WordStat,
+    GroupStat,
+    ScoreDistribution,
+    GetWordStatsResponse,
+    SubmitResult,
+    PostBatchSubmitResponse,
 )
 
 __all__ =[
@@ -59,4 +74,17 @@ __all__ =[
     'PaperMeta',
     'GetStudentsResponse',
     'GetTestPaperResponse',
+    'SamplingMode',
+    'GetMetricsResponse',
+    'ExportFormat',
+    'GetAnalyticsResponse',
+    'StudentStat',
+    'WordStat',
+    'GroupStat',
+    'ScoreDistribution',
+    'TextStat',
+    'UserTextStat',
+    'GetWordStatsResponse',
+    'SubmitResult',
+    'PostBatchSubmitResponse',
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 import uuid
 
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Dict, List, Optional
 from app.schemas import APIStatus, Paper, UserDTO, TestPaper
 from app.schemas.test_paper import PaperMeta
 
@@ -16,11 +16,78 @@ class GetPaperResponse(BaseResponse):
     paper: Paper
 
 class PostSubmitResponse(BaseResponse):
-    score: int
+    score: float
     user: UserDTO
 
+class SubmitResult(BaseModel):
+    test_id: uuid.UUID
+    ok: bool
+    score: Optional[float] = None
+    error: Optional[str] = None
+
+class PostBatchSubmitResponse(BaseResponse):
+    results: List[SubmitResult]
+
 class GetResultResponse(BaseResponse):
     papers: List[PaperMeta]
+    next_cursor: Optional[str] = None
     
 class GetStudentsResponse(BaseResponse):
-    students: List[UserDTO]
\ No newline at end of file
+    students: List[UserDTO]
+    next_cursor: Optional[str] = None
+
+class PoolStats(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
+
+class CacheStats(BaseModel):
+    size: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+class GetMetricsResponse(BaseResponse):
+    pools: Dict[str, PoolStats]
+    caches: Dict[str, CacheStats]
+
+class StudentStat(BaseModel):
+    student_id: uuid.UUID
+    user_name: str
+    papers: int
+    average_score: float
+
+class WordStat(BaseModel):
+    text_id: int
+    name: str
+    asked: int
+    wrong: int
+    error_rate: float
+
+class GroupStat(BaseModel):
+    key: str
+    asked: int
+    accuracy: float
+
+class ScoreDistribution(BaseModel):
+    mean: float
+    p50: float
+    p90: float
+    histogram: List[int]
+
+class GetAnalyticsResponse(BaseResponse):
+    paper_count: int
+    problem_count: int
+    students: List[StudentStat]
+    words: List[WordStat]
+    tags: List[GroupStat]
+    difficulties: List[GroupStat]
+    scores: ScoreDistribution
+
+class GetWordStatsResponse(BaseResponse):
+    words: List[WordStat]
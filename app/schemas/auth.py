@@ -2,15 +2,17 @@ import datetime
 import jwt
 import uuid
 from pydantic import BaseModel, Field
+from typing import List, Optional
 from sqlmodel import SQLModel, Session, Field as SQLModelField, select
-
-from argon2 import PasswordHasher
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Index, tuple_
 
 from app.schemas.enum import UType
 from app.core.config import settings
 from app.core.db import engine
-
-encoder = PasswordHasher()
+from app.core.security import encoder, password_worker
+from app.core.cache import user_cache
+from app.core.cursor import decode_cursor
 
 
 class UserCreate(BaseModel):
@@ -28,9 +30,24 @@ class UserDTO(BaseModel):
     user_nickname: str = "김성동"
     user_type: UType = UType.STUDENT
 
+def like_prefix(prefix: str) -> str:
+    """ 사용자가 입력한 접두사의 %, _, \\ 를 이스케이프한 LIKE 패턴 (Postgres 기본 이스케이프 문자 \\) """
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
 class User(SQLModel, table=True):
 
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_user_user_type_user_name_id", "user_type", "user_name", "id"),
+        # 이름 접두사 검색(LIKE 'prefix%')용. C가 아닌 collation에서는 위 인덱스를 LIKE에 쓰지 못함
+        Index(
+            "ix_user_user_type_user_name_pattern",
+            "user_type", "user_name",
+            postgresql_ops={"user_name": "text_pattern_ops"},
+        ),
+        {"extend_existing": True},
+    )
 
     id: uuid.UUID = SQLModelField(default_factory=uuid.uuid4, primary_key=True)  # 기본 키로 설정
     name: str = SQLModelField(default="admin")
@@ -49,6 +66,76 @@ class User(SQLModel, table=True):
             print("유저 정보 조회중 오류남: ", e)
             return None
 
+    @classmethod
+    async def aget_all(cls, db: AsyncSession):
+        try:
+            stmt = select(cls)
+            return (await db.exec(stmt)).all()
+        except Exception as e:
+            print("유저 정보 조회중 오류남: ", e)
+            return None
+
+    @classmethod
+    def _students_stmt(
+        cls,
+        name_prefix: Optional[str],
+        limit: Optional[int],
+        cursor: Optional[str],
+    ):
+        """ 
+        학생만 이름(user_name), id 순으로 읽습니다. 비밀번호 해시는 읽지 않습니다.
+        cursor는 이전 페이지 마지막 행의 (user_name, id) 입니다. 형식이 맞지 않으면 ValueError
+        """
+        stmt = (
+            select(cls.id, cls.name, cls.user_name, cls.user_nickname, cls.user_type)
+            .where(cls.user_type == UType.STUDENT)
+        )
+        if name_prefix:
+            # ESCAPE 절 없이 상수 접두사만 남겨야 플래너가 text_pattern_ops 인덱스 범위로 바꿀 수 있음
+            stmt = stmt.where(cls.user_name.like(like_prefix(name_prefix))) # type: ignore
+        if cursor is not None:
+            user_name, id = decode_cursor(cursor, 2)
+            stmt = stmt.where(tuple_(cls.user_name, cls.id) > tuple_(user_name, uuid.UUID(id)))
+
+        stmt = stmt.order_by(cls.user_name, cls.id) # type: ignore
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    @classmethod
+    def get_students(
+        cls,
+        db: Session,
+        name_prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List["UserDTO"]:
+        stmt = cls._students_stmt(name_prefix, limit, cursor)
+        return [UserDTO.model_validate(row._mapping) for row in db.exec(stmt).all()]
+
+    @classmethod
+    async def aget_students(
+        cls,
+        db: AsyncSession,
+        name_prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List["UserDTO"]:
+        """ get_students의 async 버전입니다. """
+        stmt = cls._students_stmt(name_prefix, limit, cursor)
+        return [UserDTO.model_validate(row._mapping) for row in (await db.exec(stmt)).all()]
+
+    @classmethod
+    def _new_record(cls, user: UserCreate, hashed: str) -> "User":
+        return cls(
+            id=uuid.uuid4(),
+            name=user.name,
+            password=hashed,
+            user_name=user.user_name,
+            user_nickname=user.user_nickname,
+            user_type=UType.STUDENT
+        )
+
     @classmethod
     def create(cls, db: Session, user: UserCreate):
         
@@ -63,21 +150,40 @@ class User(SQLModel, table=True):
         hashed = encoder.hash(user.password+settings.PEPPER)
 
         try:
-            new_record = cls(
-                id=uuid.uuid4(),
-                name=user.name,
-                password=hashed,
-                user_name=user.user_name,
-                user_nickname=user.user_nickname,
-                user_type=UType.STUDENT
-            )
+            new_record = cls._new_record(user, hashed)
             db.add(new_record)
             db.commit()
+            user_cache.invalidate(new_record.name)
             return new_record
         except Exception as e:
             db.rollback()
             print("유저 생성중 오류남: ", e)
             return None
+
+    @classmethod
+    async def acreate(cls, db: AsyncSession, user: UserCreate):
+        
+        try:
+            exist = await cls.aget(db, user.name)
+            if exist:
+                return None
+        except Exception as e:
+            print("유저 중복 확인중 오류남: ", e)
+            return None
+        
+        # 해싱 대기열이 가득 차면 HashingBusy가 그대로 올라감
+        hashed = await password_worker.hash(user.password)
+
+        try:
+            new_record = cls._new_record(user, hashed)
+            db.add(new_record)
+            await db.commit()
+            user_cache.invalidate(new_record.name)
+            return new_record
+        except Exception as e:
+            await db.rollback()
+            print("유저 생성중 오류남: ", e)
+            return None
         
     @classmethod
     def get(cls, db: Session, name: str):
@@ -88,6 +194,15 @@ class User(SQLModel, table=True):
             print("유저 정보 조회중 오류남: ", e)
             return None
         
+    @classmethod
+    async def aget(cls, db: AsyncSession, name: str):
+        try:
+            stmt = select(cls).where(cls.name == name)
+            return (await db.exec(stmt)).first()
+        except Exception as e:
+            print("유저 정보 조회중 오류남: ", e)
+            return None
+        
     @classmethod
     def get_by_id(cls, db: Session, id: uuid.UUID):
         try:
@@ -97,6 +212,15 @@ class User(SQLModel, table=True):
             print("유저 정보 조회중 오류남: ", e)
             return
         
+    @classmethod
+    async def aget_by_id(cls, db: AsyncSession, id: uuid.UUID):
+        try:
+            stmt = select(cls).where(cls.id == id)
+            return (await db.exec(stmt)).first()
+        except Exception as e:
+            print("유저 정보 조회중 오류남: ", e)
+            return
+        
 
     def verify(self, password: str):
         try:
@@ -104,6 +228,10 @@ class User(SQLModel, table=True):
         except Exception:
             return False
 
+    async def averify(self, password: str):
+        """ 해싱 전용 스레드풀에서 검증합니다. 대기열이 가득 차면 HashingBusy를 냅니다. """
+        return await password_worker.verify(self.password, password)
+
 class Payload(BaseModel):
     sub: str
     exp: datetime.datetime
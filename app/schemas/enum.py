@@ -37,4 +37,15 @@ class APIStatus(Enum):
 class StoreSearchOption(Enum):
     ALL = 'all'
     META = 'meta'
-    VALUE = 'value'
\ No newline at end of file
+    VALUE = 'value'
+
+
+class SamplingMode(Enum):
+    """MEMORY -> 단어장 캐시에서 추출, DATABASE -> Postgres에서 필요한 행만 추출"""
+    MEMORY = 'memory'
+    DATABASE = 'database'
+
+
+class ExportFormat(Enum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
@@ -5,7 +5,7 @@ from typing import (
     Optional
 )
 from sqlmodel import SQLModel, Field as sqlmodelField
-from pydantic import BaseModel, field_validator, Field
+from pydantic import BaseModel, field_validator, Field, PrivateAttr
 
 from app.schemas.enum import Tag, Difficulty, QType
 from app.schemas.auth import User
@@ -30,6 +30,11 @@ class Text(SQLModel, table=True):
     k_description: str
         
 
+def candidate_u_id(problem_u_id: uuid.UUID, candidate_id: int) -> uuid.UUID:
+    """ 문제의 u_id와 보기 번호로 보기의 u_id를 만듭니다. (저장할때 보기 u_id를 생략하기 위함) """
+    return uuid.uuid5(problem_u_id, str(candidate_id))
+
+
 class Candidate(BaseModel):
     id: int = 0
     u_id: uuid.UUID = Field(default_factory=uuid.uuid4)
@@ -51,6 +56,9 @@ class Problem(BaseModel):
     question_type: QType = QType.KOREAN
     candidates: List[Candidate]
 
+    # get_answer_obj 결과. question/answer/corrected 마다 보기를 다시 훑지 않도록 함
+    _answer_obj: Optional[Candidate] = PrivateAttr(default=None)
+
     @property
     def question(self) -> Question:
         answer_obj = self.get_answer_obj()
@@ -98,8 +106,11 @@ class Problem(BaseModel):
         """
         1. 하나의 문제에 정답 하나
         2. 하나의 문제에 중복된 candidate 없기
+        3. 하나의 문제에 같은 단어, 같은 뜻의 보기 없기
         """
         seen = set()
+        seen_texts = set()
+        seen_descriptions = set()
 
         # 중복된 candidate 없어야함
         for c in self.candidates:
@@ -107,6 +118,17 @@ class Problem(BaseModel):
                 raise ValueError("하나의 문제에 중복된 candidate가 있습니다.") 
             else:
                 seen.add(c.id)
+
+            if c.text.id in seen_texts:
+                raise ValueError("하나의 문제에 같은 단어가 두번 나옵니다.")
+            else:
+                seen_texts.add(c.text.id)
+
+            description = c.text.k_description.strip()
+            if description in seen_descriptions:
+                raise ValueError("하나의 문제에 뜻이 같은 보기가 있습니다.")
+            else:
+                seen_descriptions.add(description)
         
         true_answers = [candidate for candidate in self.candidates if candidate.answer]
         
@@ -120,9 +142,14 @@ class Problem(BaseModel):
             raise ValueError("Candidates의 ID는 연속적이어야 합니다.")
 
     def get_answer_obj(self) -> Candidate:
-        
+        # 정답 표시가 바뀌었으면(inject_answer 전 등) 다시 찾음
+        cached = self._answer_obj
+        if cached is not None and cached.answer is True:
+            return cached
+
         for c in self.candidates:
             if c.answer is True:
+                self._answer_obj = c
                 return c
         
         raise ValueError("정답이 없습니다.")
@@ -0,0 +1,137 @@
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import SQLModel, Session, select, Field as SQLModelField
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Float, cast, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.schemas.problem import Text
+
+# (shown, correct, last_seen)
+Counter = Tuple[int, int, datetime]
+
+# 한 문장의 바인드 파라미터 수 제한(65535)을 넘지 않도록 나눠서 upsert
+CHUNK_SIZE = 5000
+
+
+def _chunks(counters: Dict) -> List[Dict]:
+    items = list(counters.items())
+    return [dict(items[i:i + CHUNK_SIZE]) for i in range(0, len(items), CHUNK_SIZE)]
+
+
+class TextStat(SQLModel, table=True):
+    """
+    단어(Text)별 누적 출제/정답 횟수입니다. 제출할때마다 StatsBuffer가 모아서 더합니다.
+    shown: 정답 단어로 출제된 횟수, correct: 맞춘 횟수, last_seen: 마지막으로 제출된 시각
+    """
+
+    __table_args__ = {"extend_existing": True}
+
+    text_id: int = SQLModelField(primary_key=True)
+    shown: int = SQLModelField(default=0, nullable=False)
+    correct: int = SQLModelField(default=0, nullable=False)
+    last_seen: Optional[datetime] = SQLModelField(default=None)
+
+    @classmethod
+    def _add_stmt(cls, counters: Dict[int, Counter]):
+        """ 기존 값에 더하는 upsert 한 문장을 만듭니다. """
+        stmt = pg_insert(cls).values([
+            dict(text_id=text_id, shown=shown, correct=correct, last_seen=last_seen)
+            for text_id, (shown, correct, last_seen) in counters.items()
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=["text_id"],
+            set_={
+                "shown": cls.shown + stmt.excluded.shown,
+                "correct": cls.correct + stmt.excluded.correct,
+                "last_seen": func.greatest(cls.last_seen, stmt.excluded.last_seen),
+            },
+        )
+
+    @classmethod
+    def _hardest_stmt(cls, limit: int, min_shown: int):
+        error_rate = 1 - cast(cls.correct, Float) / cls.shown
+        return (
+            select(cls.text_id, Text.name, cls.shown, cls.correct, error_rate)
+            .join(Text, Text.id == cls.text_id) # type: ignore
+            .where(cls.shown >= min_shown)
+            .order_by(error_rate.desc(), cls.shown.desc()) # type: ignore
+            .limit(limit)
+        )
+
+    @classmethod
+    async def ahardest(cls, db: AsyncSession, limit: int = 50, min_shown: int = 1) -> List:
+        """ 오답률이 높은 단어 순으로 (text_id, name, shown, correct, error_rate) 를 리턴합니다. """
+        return list((await db.exec(cls._hardest_stmt(limit, min_shown))).all()) # type: ignore
+
+
+class UserTextStat(SQLModel, table=True):
+    """ 유저별, 단어별 누적 출제/정답 횟수입니다. (TextStat의 유저 단위 버전) """
+
+    __table_args__ = {"extend_existing": True}
+
+    user_id: uuid.UUID = SQLModelField(primary_key=True)
+    text_id: int = SQLModelField(primary_key=True)
+    shown: int = SQLModelField(default=0, nullable=False)
+    correct: int = SQLModelField(default=0, nullable=False)
+    last_seen: Optional[datetime] = SQLModelField(default=None)
+
+    @classmethod
+    def _add_stmt(cls, counters: Dict[Tuple[uuid.UUID, int], Counter]):
+        stmt = pg_insert(cls).values([
+            dict(user_id=user_id, text_id=text_id, shown=shown, correct=correct, last_seen=last_seen)
+            for (user_id, text_id), (shown, correct, last_seen) in counters.items()
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=["user_id", "text_id"],
+            set_={
+                "shown": cls.shown + stmt.excluded.shown,
+                "correct": cls.correct + stmt.excluded.correct,
+                "last_seen": func.greatest(cls.last_seen, stmt.excluded.last_seen),
+            },
+        )
+
+    @classmethod
+    def _hardest_stmt(cls, user_id: uuid.UUID, limit: int, min_shown: int):
+        error_rate = 1 - cast(cls.correct, Float) / cls.shown
+        return (
+            select(cls.text_id, Text.name, cls.shown, cls.correct, error_rate)
+            .join(Text, Text.id == cls.text_id) # type: ignore
+            .where(cls.user_id == user_id)
+            .where(cls.shown >= min_shown)
+            .order_by(error_rate.desc(), cls.shown.desc()) # type: ignore
+            .limit(limit)
+        )
+
+    @classmethod
+    async def ahardest(
+        cls,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        limit: int = 50,
+        min_shown: int = 1
+    ) -> List:
+        """ 유저가 많이 틀린 단어 순으로 (text_id, name, shown, correct, error_rate) 를 리턴합니다. """
+        return list((await db.exec(cls._hardest_stmt(user_id, limit, min_shown))).all()) # type: ignore
+
+
+def add_counters(
+    db: Session,
+    texts: Dict[int, Counter],
+    users: Dict[Tuple[uuid.UUID, int], Counter],
+) -> None:
+    """ 단어별, 유저별 카운터를 한 트랜잭션으로 더합니다. (한쪽만 반영되는 일이 없도록) """
+    if not texts:
+        return
+
+    try:
+        for chunk in _chunks(texts):
+            db.exec(TextStat._add_stmt(chunk)) # type: ignore
+        for chunk in _chunks(users):
+            db.exec(UserTextStat._add_stmt(chunk)) # type: ignore
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
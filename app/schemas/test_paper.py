@@ -6,16 +6,40 @@ from typing import (
     Optional, 
     Dict, 
     Tuple,
-    Any
+    Any,
+    AsyncIterator,
+    Set,
 )
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from sqlmodel import SQLModel, Session, select, Field as SQLModelField
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Index, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 
-from app.schemas.enum import Difficulty, StoreSearchOption
-from app.schemas.problem import Problem, QA, Text
+from app.schemas.enum import Difficulty, StoreSearchOption, UType
+from app.schemas.problem import Candidate, Problem, QA, Text
 from app.schemas.auth import User, UserDTO
+from app.core.config import settings
+from app.core.cursor import decode_cursor
+
+
+def difficulty_weights() -> Dict[Difficulty, float]:
+    """ 채점에 쓰는 난이도별 가중치 (settings.DIFFICULTY_WEIGHT_*) """
+    return {
+        Difficulty.EASY: settings.DIFFICULTY_WEIGHT_EASY,
+        Difficulty.MODERATE: settings.DIFFICULTY_WEIGHT_MODERATE,
+        Difficulty.HARD: settings.DIFFICULTY_WEIGHT_HARD,
+    }
+
+
+# 점수는 소수점 둘째 자리까지 (가중치 나눗셈의 부동소수점 오차가 저장/응답에 남지 않도록)
+SCORE_DECIMALS = 2
+
+
+def weighted_score(corrected: float, all_weights: float) -> float:
+    """ 맞은 문제의 가중치 합 / 전체 가중치 합 * 100 을 SCORE_DECIMALS 자리로 반올림합니다. """
+    return round(corrected * 100 / all_weights, SCORE_DECIMALS) if all_weights else 0.0
 
 
 class PaperStore(SQLModel, table=True):
@@ -24,14 +48,25 @@ class PaperStore(SQLModel, table=True):
     key: request_id (문제를 요청할때의 request_id)
     value: 문제지의 정보를 담고 있는 dict
 
-    
+    user_id, paper_id: prefix를 나눠서 저장한 컬럼 (인덱스를 타는 namespace 검색용)
+    score, submitted, problem_count: 제출시 저장되는 결과 (목록 조회에서 value를 읽지 않기 위함)
     """
 
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_paperstore_user_id_paper_id", "user_id", "paper_id"),
+        Index("ix_paperstore_user_id_submitted_updated_at", "user_id", "submitted", "updated_at"),
+        Index("ix_paperstore_submitted_updated_at_key", "submitted", "updated_at", "key"),
+        {"extend_existing": True},
+    )
 
     prefix: str = SQLModelField(primary_key=True, nullable=False, description="Represents the doc's namespace")
     key: str = SQLModelField(primary_key=True, nullable=False, description="The unique key for the value")
+    user_id: Optional[uuid.UUID] = SQLModelField(default=None, description="The first part of the namespace")
+    paper_id: Optional[uuid.UUID] = SQLModelField(default=None, description="The second part of the namespace")
     value: Dict = SQLModelField(sa_type=JSONB, nullable=False, description="The JSON value stored in the table")  # dict로 변경
+    score: Optional[float] = SQLModelField(default=None, description="The score computed when the paper was submitted")
+    submitted: bool = SQLModelField(default=False, nullable=False, description="Whether the paper was submitted")
+    problem_count: Optional[int] = SQLModelField(default=None, description="The number of problems in the paper")
     created_at: Optional[datetime] = SQLModelField(
         default_factory=datetime.now,
         nullable=False,
@@ -48,17 +83,197 @@ class PaperStore(SQLModel, table=True):
         cls,
         db: Session,
         namespace: Tuple[Any, ...],
-        search_option: StoreSearchOption = StoreSearchOption.ALL
+        search_option: StoreSearchOption = StoreSearchOption.ALL,
+        submitted: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> List["PaperStore"] | List["Paper"] | List["PaperMeta"]:
-        """ """
+        """ 
+        최신순(updated_at, key 내림차순)으로 검색합니다.
+        submitted가 주어지면 제출 여부로 거르고, cursor는 이전 페이지 마지막 행의 (updated_at, key) 입니다.
+        """
+        stmt = cls._search_stmt(namespace, search_option, submitted, limit, cursor)
+        return cls._search_result(search_option, db.exec(stmt).all())
+
+    @classmethod
+    async def asearch(
+        cls,
+        db: AsyncSession,
+        namespace: Tuple[Any, ...],
+        search_option: StoreSearchOption = StoreSearchOption.ALL,
+        submitted: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List["PaperStore"] | List["Paper"] | List["PaperMeta"]:
+        """ search의 async 버전입니다. """
+        stmt = cls._search_stmt(namespace, search_option, submitted, limit, cursor)
+        return cls._search_result(search_option, (await db.exec(stmt)).all())
+
+    @classmethod
+    def _search_stmt(
+        cls,
+        namespace: Tuple[Any, ...],
+        search_option: StoreSearchOption,
+        submitted: Optional[bool],
+        limit: Optional[int],
+        cursor: Optional[str],
+    ):
         match search_option:
             case StoreSearchOption.ALL:
-                return cls._search_all(db, namespace)
+                stmt = select(cls)
             case StoreSearchOption.META:
-                return cls._search_only_meta(db, namespace)
+                stmt = select(
+                    cls.prefix, 
+                    cls.key, 
+                    cls.created_at, 
+                    cls.updated_at, 
+                    cls.score, 
+                    cls.problem_count
+                )
             case StoreSearchOption.VALUE:
-                return cls._search_only_value(db, namespace)
+                stmt = select(cls.value)
+
+        stmt = stmt.where(*cls._namespace_clauses(namespace))
+        return cls._paginate(stmt, submitted, limit, cursor)
+
+    @classmethod
+    def _search_result(
+        cls,
+        search_option: StoreSearchOption,
+        rows: Any,
+    ) -> List["PaperStore"] | List["Paper"] | List["PaperMeta"]:
+        match search_option:
+            case StoreSearchOption.ALL:
+                return list(rows)
+            case StoreSearchOption.META:
+                return [
+                    PaperMeta(
+                        paper_id=tp[0].split(".")[-1],
+                        test_id=tp[1],
+                        created_at=tp[2] if tp[2] is not None else datetime.now(),
+                        updated_at=tp[3] if tp[3] is not None else datetime.now(),
+                        score=tp[4],
+                        problem_count=tp[5],
+                    )
+                    for tp in rows
+                ]
+            case StoreSearchOption.VALUE:
+                # codec이 단어장 캐시(app.factory)를 쓰므로 순환 import를 피해 여기서 import
+                from app.factory.codec import decode_paper
+                return [decode_paper(dic) for dic in rows]
     
+    @classmethod
+    def _paginate(
+        cls,
+        stmt,
+        submitted: Optional[bool],
+        limit: Optional[int],
+        cursor: Optional[str],
+    ):
+        """ 제출 여부 조건과 keyset 페이지네이션을 붙입니다. """
+        if submitted is not None:
+            stmt = stmt.where(cls.submitted == submitted)
+
+        if cursor is not None:
+            updated_at, key = decode_cursor(cursor, 2)
+            stmt = stmt.where(
+                tuple_(cls.updated_at, cls.key) < tuple_(datetime.fromisoformat(updated_at), key)
+            )
+
+        stmt = stmt.order_by(cls.updated_at.desc(), cls.key.desc()) # type: ignore
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        return stmt
+
+    @classmethod
+    def _export_stmt(
+        cls,
+        student_id: Optional[uuid.UUID],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        limit: Optional[int],
+        cursor: Optional[str],
+    ):
+        """ 학생들의 제출된 문제지를 유저 정보와 함께 최신순으로 읽습니다. (value는 읽지 않음) """
+        stmt = (
+            select(
+                User.id,
+                User.user_name,
+                User.name,
+                cls.paper_id,
+                cls.key,
+                cls.score,
+                cls.problem_count,
+                cls.created_at,
+                cls.updated_at,
+            )
+            .join(User, User.id == cls.user_id) # type: ignore
+            .where(User.user_type == UType.STUDENT)
+        )
+        if student_id is not None:
+            stmt = stmt.where(cls.user_id == student_id)
+        if since is not None:
+            stmt = stmt.where(cls.updated_at >= since)
+        if until is not None:
+            stmt = stmt.where(cls.updated_at < until)
+
+        return cls._paginate(stmt, True, limit, cursor)
+
+    @classmethod
+    async def aexport(
+        cls,
+        db: AsyncSession,
+        student_id: Optional[uuid.UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Any]]:
+        """ 
+        _export_stmt 결과를 서버 커서로 batch_size 행씩 나눠서 돌려줍니다.
+        한번에 batch_size 행만 메모리에 올라가므로 학생 수, 기간과 상관없이 메모리가 일정합니다.
+        """
+        stmt = cls._export_stmt(student_id, since, until, limit, cursor)
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+    @classmethod
+    def _split_namespace(
+        cls,
+        namespace: Tuple[Any, ...]
+    ) -> Tuple[Optional[uuid.UUID], Optional[uuid.UUID]]:
+        """ (user_id,) 혹은 (user_id, paper_id) 형태의 namespace를 나눕니다. """
+        user_id = uuid.UUID(str(namespace[0])) if len(namespace) > 0 else None
+        paper_id = uuid.UUID(str(namespace[1])) if len(namespace) > 1 else None
+        return user_id, paper_id
+
+    @classmethod
+    def _namespace_clauses(
+        cls,
+        namespace: Tuple[Any, ...]
+    ) -> List[Any]:
+        """ (user_id, paper_id) 복합 인덱스를 타도록 namespace를 컬럼 조건으로 바꿉니다. """
+        user_id, paper_id = cls._split_namespace(namespace)
+        clauses = [cls.user_id == user_id]
+        if paper_id is not None:
+            clauses.append(cls.paper_id == paper_id)
+        return clauses
+
+    @classmethod
+    def _get_stmt(
+        cls,
+        namespace: Tuple[Any, ...],
+        key: Any
+    ):
+        prefix = ".".join(map(str, namespace))
+        return (
+            select(cls.value)
+            .where(cls.prefix == prefix)
+            .where(cls.key == str(key))
+        )
 
     @classmethod
     def get(
@@ -68,17 +283,105 @@ class PaperStore(SQLModel, table=True):
         key: Any
     ) -> Optional[Dict]:
         """ """
-        try:
-            prefix = ".".join(map(str, namespace))
-            stmt = (
-                select(cls.value)
-                .where(cls.prefix == prefix)
-                .where(cls.key == str(key))
-            )
-            return db.exec(stmt).first() # type: ignore
-        except Exception as e:
-            raise e
-    
+        return db.exec(cls._get_stmt(namespace, key)).first() # type: ignore
+
+    @classmethod
+    async def aget(
+        cls,
+        db: AsyncSession,
+        namespace: Tuple[Any, ...],
+        key: Any
+    ) -> Optional[Dict]:
+        """ get의 async 버전입니다. """
+        return (await db.exec(cls._get_stmt(namespace, key))).first() # type: ignore
+
+    @classmethod
+    async def aget_submission(
+        cls,
+        db: AsyncSession,
+        namespace: Tuple[Any, ...],
+        key: Any
+    ) -> Optional[Tuple[Dict, bool]]:
+        """ (value, 이미 제출됐는지) 를 리턴합니다. """
+        stmt = (
+            select(cls.value, cls.submitted)
+            .where(cls.prefix == ".".join(map(str, namespace)))
+            .where(cls.key == str(key))
+        )
+        return (await db.exec(stmt)).first() # type: ignore
+
+    @classmethod
+    async def aget_submissions(
+        cls,
+        db: AsyncSession,
+        keys: List[Tuple[Tuple[Any, ...], Any]]
+    ) -> Dict[Tuple[str, str], Tuple[Dict, bool]]:
+        """ 
+        (namespace, key) 목록을 한 번의 WHERE (prefix, key) IN (...) 로 읽습니다.
+        (prefix, key) -> (value, 이미 제출됐는지). 없는 키는 빠져있습니다.
+        """
+        pairs = {(".".join(map(str, namespace)), str(key)) for namespace, key in keys}
+        if not pairs:
+            return {}
+
+        stmt = (
+            select(cls.prefix, cls.key, cls.value, cls.submitted)
+            .where(tuple_(cls.prefix, cls.key).in_(pairs))
+        )
+        rows = (await db.exec(stmt)).all() # type: ignore
+        return {(prefix, key): (value, submitted) for prefix, key, value, submitted in rows}
+
+    @classmethod
+    def _row(
+        cls,
+        namespace: Tuple[Any, ...],
+        key: Any,
+        value: Dict,
+        score: Optional[float] = None,
+        submitted: bool = False,
+        problem_count: Optional[int] = None,
+    ) -> Dict:
+        now = datetime.now()
+        user_id, paper_id = cls._split_namespace(namespace)
+        return dict(
+            prefix=".".join(map(str, namespace)),
+            key=str(key),
+            user_id=user_id,
+            paper_id=paper_id,
+            value=value,
+            score=score,
+            submitted=submitted,
+            problem_count=problem_count,
+            created_at=now,
+            updated_at=now,
+        )
+
+    @classmethod
+    def _rows(
+        cls,
+        items: List[Tuple[Any, ...]]
+    ) -> List[Dict]:
+        """ 같은 키가 여러번 있으면 마지막 값만 남깁니다. (ON CONFLICT는 한 문장에서 같은 행을 두번 바꿀 수 없음) """
+        rows = {}
+        for namespace, key, value, *columns in items:
+            row = cls._row(namespace, key, value, **(columns[0] if columns else {}))
+            rows[(row["prefix"], row["key"])] = row
+        return list(rows.values())
+
+    @classmethod
+    def _upsert(cls, rows: List[Dict]):
+        """ INSERT ... ON CONFLICT (prefix, key) DO UPDATE 한 문장으로 저장합니다. """
+        stmt = pg_insert(cls).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=["prefix", "key"],
+            set_={
+                "value": stmt.excluded.value,
+                "score": stmt.excluded.score,
+                "submitted": stmt.excluded.submitted,
+                "problem_count": stmt.excluded.problem_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
 
     @classmethod
     def put(
@@ -86,110 +389,135 @@ class PaperStore(SQLModel, table=True):
         db: Session,
         namespace: Tuple[Any, ...],
         key: Any,
-        value: Dict
+        value: Dict,
+        score: Optional[float] = None,
+        submitted: bool = False,
+        problem_count: Optional[int] = None,
     ) -> None:
         """ """
         try:
-            prefix = ".".join(map(str, namespace))
-            
-            # 기존 레코드 조회
-            statement = select(cls).where(cls.prefix == prefix, cls.key == str(key))
-            result = db.exec(statement).first()
-            
-            if result:
-                result.value = value
-                result.updated_at = datetime.now()
-                db.add(result)
-            else:
-                new_record = cls(
-                    prefix=prefix,
-                    key=str(key),
-                    value=value,
-                    created_at=datetime.now(),
-                    updated_at=datetime.now()
-                )
-                db.add(new_record)
-            
+            row = cls._row(namespace, key, value, score, submitted, problem_count)
+            db.exec(cls._upsert([row])) # type: ignore
             db.commit()
         except Exception as e:
             db.rollback()
             raise e
-        
 
     @classmethod
-    def _search_all(
+    async def aput(
         cls,
-        db: Session,
-        namespace: Tuple[Any, ...]
-    ) -> List["PaperStore"]:
-        """ """
+        db: AsyncSession,
+        namespace: Tuple[Any, ...],
+        key: Any,
+        value: Dict,
+        score: Optional[float] = None,
+        submitted: bool = False,
+        problem_count: Optional[int] = None,
+    ) -> None:
+        """ put의 async 버전입니다. """
         try:
-            prefix_pattern = "%"+ ".".join(map(str, namespace)) + "%"
-            stmt = (
-                select(cls)
-                .where(cls.prefix.like(prefix_pattern)) # type: ignore
-            )
-            return db.exec(stmt).all() # type: ignore
-            
+            row = cls._row(namespace, key, value, score, submitted, problem_count)
+            await db.exec(cls._upsert([row])) # type: ignore
+            await db.commit()
         except Exception as e:
+            await db.rollback()
             raise e
-    
 
     @classmethod
-    def _search_only_value(
+    def put_many(
         cls,
         db: Session,
-        namespace: Tuple[Any, ...]
-    ) -> List["Paper"]:
-        """ """
+        items: List[Tuple[Any, ...]]
+    ) -> None:
+        """ 
+        (namespace, key, value) 혹은 (namespace, key, value, {score, submitted, problem_count}) 
+        목록을 한 문장으로 저장합니다. 같은 키가 여러번 있으면 마지막 값이 저장됩니다. 
+        """
+        if not items:
+            return
+
         try:
-            prefix_pattern = "%"+ ".".join(map(str, namespace)) + "%"
-            stmt = (
-                select(cls.value)
-                .where(cls.prefix.like(prefix_pattern)) # type: ignore
-            )
-            dictionary = db.exec(stmt).all() # type: ignore
-            return [
-                Paper.model_validate(dic).model_validate_to_end() 
-                for dic in dictionary
-            ]
-            
+            db.exec(cls._upsert(cls._rows(items))) # type: ignore
+            db.commit()
         except Exception as e:
-            raise
+            db.rollback()
+            raise e
 
     @classmethod
-    def _search_only_meta(
+    async def aput_many(
         cls,
-        db: Session,
-        namespace: Tuple[Any, ...]
-    ) -> List["PaperMeta"]:
-        """ """
+        db: AsyncSession,
+        items: List[Tuple[Any, ...]]
+    ) -> None:
+        """ put_many의 async 버전입니다. """
+        if not items:
+            return
+
         try:
-            prefix_pattern = "%"+ ".".join(map(str, namespace)) + "%"
-            stmt = (
-                select(cls.prefix, cls.key, cls.created_at, cls.updated_at)
-                .where(cls.prefix.like(prefix_pattern)) # type: ignore
-            )
-            tupled = db.exec(stmt).all() # type: ignore
-            return [
-                PaperMeta(
-                    paper_id=tp[0].split(".")[-1],
-                    test_id=tp[1],
-                    created_at=tp[2] if tp[2] is not None else datetime.now(),
-                    updated_at=tp[3] if tp[3] is not None else datetime.now()
-                )
-                for tp in tupled
-            ]
-            
+            await db.exec(cls._upsert(cls._rows(items))) # type: ignore
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise e
+
+    @classmethod
+    def _flip_stmt(cls, pairs: List[Tuple[str, str]]):
+        """ 아직 제출되지 않은 행만 submitted=True로 바꾸고 바뀐 (prefix, key) 를 돌려받습니다. """
+        return (
+            update(cls)
+            .where(tuple_(cls.prefix, cls.key).in_(pairs))
+            .where(cls.submitted == False) # noqa: E712
+            .values(submitted=True)
+            .returning(cls.prefix, cls.key)
+            .execution_options(synchronize_session=False)
+        )
+
+    @classmethod
+    async def asubmit_many(
+        cls,
+        db: AsyncSession,
+        items: List[Tuple[Any, ...]]
+    ) -> Set[Tuple[str, str]]:
+        """
+        제출된 문제지들을 aput_many처럼 저장하고, 이번에 처음 제출된 (prefix, key) 들을 리턴합니다.
+        같은 트랜잭션에서 먼저 submitted를 false -> true로 바꾸므로 동시에 같은 문제지를 제출해도
+        (행 잠금 때문에) 한쪽만 처음 제출로 판단됩니다.
+        """
+        if not items:
+            return set()
+
+        rows = cls._rows(items)
+        try:
+            flipped = (await db.exec(cls._flip_stmt([(r["prefix"], r["key"]) for r in rows]))).all() # type: ignore
+            await db.exec(cls._upsert(rows)) # type: ignore
+            await db.commit()
         except Exception as e:
+            await db.rollback()
             raise e
 
+        return {(prefix, key) for prefix, key in flipped}
+
+    @classmethod
+    async def asubmit(
+        cls,
+        db: AsyncSession,
+        namespace: Tuple[Any, ...],
+        key: Any,
+        value: Dict,
+        score: Optional[float] = None,
+        problem_count: Optional[int] = None,
+    ) -> bool:
+        """ 제출된 문제지 하나를 저장하고, 처음 제출된 것인지 리턴합니다. (asubmit_many 참고) """
+        items = [(namespace, key, value, dict(score=score, submitted=True, problem_count=problem_count))]
+        return len(await cls.asubmit_many(db, items)) > 0
+
 class PaperMeta(BaseModel):
     paper_id: str
     test_id: str
     created_at: datetime
     updated_at: datetime
-    score: Optional[int] = None
+    score: Optional[float] = None
+    problem_count: Optional[int] = None
 
 
 class Paper(BaseModel):
@@ -198,6 +526,46 @@ class Paper(BaseModel):
     answer_map: dict
     problems: List[Problem]
 
+    # (문제 u_id, 보기 u_id) -> 보기, 문제 u_id -> 체크된 보기들. 처음 채점할때 한번 만듦
+    _candidates: Optional[Dict[Tuple[uuid.UUID, uuid.UUID], Candidate]] = PrivateAttr(default=None)
+    _checked: Optional[Dict[uuid.UUID, List[Candidate]]] = PrivateAttr(default=None)
+
+    def _build_index(self) -> None:
+        candidates = {}
+        checked = {}
+        for p in self.problems:
+            checked[p.u_id] = [c for c in p.candidates if c.checked]
+            for c in p.candidates:
+                candidates[(p.u_id, c.u_id)] = c
+
+        self._candidates = candidates
+        self._checked = checked
+
+    def set_checked(self, checked_map: Dict[uuid.UUID, uuid.UUID]) -> "Paper":
+        """
+        문제 u_id -> 체크한 보기 u_id 를 반영합니다. (문제마다 Problem.set_checked를 부른 것과 같음)
+        보기를 훑지 않고 색인으로 찾으므로 체크 하나가 O(1) 입니다.
+        색인을 만든 뒤에는 체크 표시를 이 메서드로만 바꿔야 합니다.
+        """
+        if self._candidates is None or self._checked is None:
+            self._build_index()
+
+        for problem_u_id, candidate_u_id in checked_map.items():
+            previous = self._checked.get(problem_u_id) # type: ignore
+            if previous is None:
+                # 이 문제지에 없는 문제
+                continue
+
+            for c in previous:
+                c.checked = False
+
+            found = self._candidates.get((problem_u_id, candidate_u_id)) # type: ignore
+            if found is not None:
+                found.checked = True
+            self._checked[problem_u_id] = [found] if found is not None else [] # type: ignore
+
+        return self
+
     def model_validate_to_end(self):
         for p in self.problems:
             for c in p.candidates:
@@ -225,35 +593,18 @@ class Paper(BaseModel):
         )
 
     def calculate_score(self):
+        """ 맞은 문제의 가중치 합 / 전체 가중치 합 * 100. 여러장을 한번에 채점하려면 app.factory.scoring """
+        weights = difficulty_weights()
         all_weights = 0
-        weight_map = {}
+        corrected = 0
 
         for p in self.problems:
-            match p.difficulty:
-                case Difficulty.EASY:
-                    weight = 1
-                case Difficulty.MODERATE:
-                    weight = 2
-                case Difficulty.HARD:
-                    weight = 3
-                case _:
-                    weight = 2
-            
-            weight_map[p.id] = [weight, p.corrected]
-            
+            weight = weights[p.difficulty]
             all_weights += weight
+            if p.corrected:
+                corrected += weight
 
-        normalized_score_map = {
-            id: [(weight[0] / all_weights) * 100, weight[1]] for id, weight in weight_map.items()
-        }
-
-        sum = 0
-        for _, score in normalized_score_map.items():
-            if score[1]:
-                sum += score[0]
-
-        return sum
-            
+        return weighted_score(corrected, all_weights)
 
     def get_p_counts(self) -> int:
         """ 하나의 시험용지에 속한 문제들의 개수: int 를 리턴합니다 """
@@ -274,7 +625,8 @@ class TestPaper(BaseModel):
     binded: UserDTO
     q_a_set: List[QA]
 
-    def apply_changes(self, paper: Paper) -> Paper:
+    def checked_map(self) -> Dict[uuid.UUID, uuid.UUID]:
+        """ 문제 u_id -> 유저가 체크한 보기 u_id """
         checked_map = {}
         
         for qa in self.q_a_set:
@@ -283,13 +635,10 @@ class TestPaper(BaseModel):
                     checked_map[qa.question.u_id] = a.u_id
                     break
 
-        for p in paper.problems:
-            checked_candidate_id = checked_map.get(p.u_id)
-            
-            if checked_candidate_id is not None:
-                p.set_checked(checked_candidate_id)
-                
-        return paper
+        return checked_map
+
+    def apply_changes(self, paper: Paper) -> Paper:
+        return paper.set_checked(self.checked_map())
 
     
 
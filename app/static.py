@@ -1,23 +1,129 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import FileResponse, Response
-from fastapi import Request
+import os
+import re
+import mimetypes
+from email.utils import formatdate
 from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.encoding import choose_encoding
 
 ROOT = Path(__file__).parent.parent
 
-class UIMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-
-        ui_dir = str(ROOT / "frontend/dist")
-
-        if not request.url.path.startswith("/api") and not request.url.path.startswith("/docs") and not request.url.path.startswith("/redoc"):
-            file_path = Path(ui_dir + request.url.path)
-            if file_path.exists() and file_path.is_file():
-                return FileResponse(path=file_path)
-            else:
-                index_file = Path(ui_dir + "/index.html")
-                if index_file.exists() and index_file.is_file():
-                    return FileResponse(path=index_file)
-                return Response(content="Not Found", status_code=404)
-        response = await call_next(request)
-        return response
\ No newline at end of file
+# vite가 내용 해시를 붙인 파일 (예: /assets/index-BxYz12_a.js) 은 내용이 바뀌면 이름도 바뀜
+HASHED = re.compile(r"^/assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+# Accept-Encoding 값 -> 미리 압축된 파일의 확장자
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+class StaticFile:
+    """ 시작할때 한번 stat 해둔 파일 정보와 미리 압축된 사본들 """
+
+    def __init__(self, url_path: str, path: Path) -> None:
+        self.path = path
+        self.stat = path.stat()
+        self.media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self.etag = f'"{self.stat.st_size:x}-{self.stat.st_mtime_ns:x}"'
+        self.last_modified = formatdate(self.stat.st_mtime, usegmt=True)
+        self.cache_control = (
+            "public, max-age=31536000, immutable" if HASHED.match(url_path) else "no-cache"
+        )
+
+        self.variants: Dict[str, os.stat_result] = {}
+        # 인코딩마다 다른 표현이므로 ETag도 따로 (예: "1a2b-3c4d-br")
+        self.etags: Dict[Optional[str], str] = {None: self.etag}
+        for encoding, suffix in ENCODINGS.items():
+            compressed = path.with_name(path.name + suffix)
+            if compressed.is_file():
+                self.variants[encoding] = compressed.stat()
+                self.etags[encoding] = f'{self.etag[:-1]}-{suffix.lstrip(".")}"'
+
+    def choose_encoding(self, headers: Headers) -> Optional[str]:
+        """ 미리 압축된 사본 중 q 값이 가장 높은 인코딩 (같으면 ENCODINGS 순서). 없으면 None (원본) """
+        return choose_encoding(headers.get("accept-encoding", ""), list(self.variants))
+
+    def not_modified(self, headers: Headers, etag: str) -> bool:
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or etag in tags
+        return headers.get("if-modified-since") == self.last_modified
+
+    def response(self, headers: Headers) -> Response:
+        encoding = self.choose_encoding(headers)
+        common = {
+            "etag": self.etags[encoding],
+            "last-modified": self.last_modified,
+            "cache-control": self.cache_control,
+        }
+        if self.variants:
+            common["vary"] = "Accept-Encoding"
+
+        if self.not_modified(headers, self.etags[encoding]):
+            return Response(status_code=304, headers=common)
+
+        if encoding is not None:
+            return FileResponse(
+                path=self.path.with_name(self.path.name + ENCODINGS[encoding]),
+                media_type=self.media_type,
+                stat_result=self.variants[encoding],
+                headers={**common, "content-encoding": encoding},
+            )
+
+        return FileResponse(
+            path=self.path,
+            media_type=self.media_type,
+            stat_result=self.stat,
+            headers=common,
+        )
+
+
+def index_directory(directory: Path) -> Dict[str, StaticFile]:
+    """ directory 아래의 파일을 url 경로 -> StaticFile 로 색인합니다. (.br/.gz 는 원본의 사본으로만 취급) """
+    files: Dict[str, StaticFile] = {}
+    if not directory.is_dir():
+        return files
+
+    for path in directory.rglob("*"):
+        if not path.is_file() or path.suffix in ENCODINGS.values():
+            continue
+        url_path = "/" + path.relative_to(directory).as_posix()
+        files[url_path] = StaticFile(url_path, path)
+
+    return files
+
+
+class UIMiddleware:
+    """
+    frontend/dist 를 서빙하는 pure ASGI 미들웨어입니다.
+    API 요청은 경로 prefix만 보고 바로 다음 앱으로 넘기고,
+    나머지는 시작할때 만든 색인에서 찾아 서빙합니다. (없으면 index.html, SPA 라우팅)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: Path = ROOT / "frontend/dist",
+        bypass: tuple = ("/api", "/docs", "/redoc"),
+    ) -> None:
+        self.app = app
+        self.bypass = bypass
+        self.files = index_directory(directory)
+        self.index: Optional[StaticFile] = self.files.get("/index.html")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.bypass):
+            await self.app(scope, receive, send)
+            return
+
+        found = self.files.get(scope["path"], self.index)
+        if found is None:
+            response = Response(content="Not Found", status_code=404)
+        else:
+            response = found.response(Headers(scope=scope))
+
+        await response(scope, receive, send)
@@ -0,0 +1,43 @@
+"""
+벤치마크용 최소 HTTP/1.1 클라이언트입니다. (의존성 없이 asyncio 스트림만 사용)
+"""
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+async def request(
+    url: str,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    body: bytes = b"",
+) -> Tuple[int, bytes, float]:
+    """ (status, body, 걸린시간 ms) 를 리턴합니다. """
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    start = time.perf_counter()
+
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}", "Connection: close"]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    if body:
+        lines.append(f"Content-Length: {len(body)}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+    raw = await reader.read()
+    writer.close()
+    took = (time.perf_counter() - start) * 1000
+
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1]) if head else 0
+    return status, payload, took
+
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
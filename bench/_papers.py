@@ -0,0 +1,66 @@
+"""
+벤치마크용 가짜 문제지를 DB 없이 만듭니다.
+"""
+import random
+import uuid
+from typing import List
+
+from app.schemas import Candidate, Paper, Problem, Tag, Text, UserDTO
+from app.schemas.problem import candidate_u_id
+from app.factory.vocabulary import Vocabulary
+
+
+def make_texts(count: int) -> List[Text]:
+    tags = list(Tag)
+    return [
+        Text(id=i, name=f"word{i}", tag=random.choice(tags), k_description=f"단어{i}의 뜻")
+        for i in range(count)
+    ]
+
+
+def make_vocabulary(count: int) -> Vocabulary:
+    """ make_texts(count)와 같은 단어들로 된 단어장 (make_paper의 v2 문제지를 되살릴 수 있음) """
+    texts = make_texts(count)
+    return Vocabulary(
+        [t.id for t in texts],
+        [t.name for t in texts],
+        [t.tag for t in texts],
+        [t.k_description for t in texts],
+        (),
+    )
+
+
+def make_paper(
+    problems: int = 20,
+    candidates: int = 4,
+    checked: bool = True,
+    derived_u_ids: bool = True,
+) -> Paper:
+    """ derived_u_ids=False 이면 예전처럼 보기 u_id를 랜덤으로 만듭니다. (v1 시절 문제지) """
+    texts = iter(make_texts(problems * candidates))
+
+    made = []
+    for i in range(problems):
+        problem_u_id = uuid.uuid4()
+        answer = random.randrange(candidates)
+        picked = random.randrange(candidates) if checked else -1
+        made.append(Problem(
+            id=i,
+            u_id=problem_u_id,
+            candidates=[
+                Candidate(
+                    id=j,
+                    u_id=candidate_u_id(problem_u_id, j) if derived_u_ids else uuid.uuid4(),
+                    text=next(texts),
+                    answer=(j == answer),
+                    checked=(j == picked),
+                )
+                for j in range(candidates)
+            ],
+        ))
+
+    return Paper(
+        binded=UserDTO(),
+        answer_map={p.u_id: p.get_answer_obj().u_id for p in made},
+        problems=made,
+    )
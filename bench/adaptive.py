@@ -0,0 +1,59 @@
+"""
+적응형 출제(UserWeights + alias table)의 가중치 생성 비용과 문제지 1장 추출 시간을 측정합니다.
+
+    python -m bench.adaptive
+
+DB 없이 가짜 단어장 5만개와 유저 기록(1천 ~ 5만 단어)으로 측정합니다.
+"""
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.factory.adaptive import UserWeights
+from app.factory.sampler import draw_groups
+from bench._papers import make_vocabulary
+
+WORDS = 50_000
+HISTORIES = [1_000, 10_000, 50_000]
+PROBLEMS, CANDIDATES = 20, 4
+REPEAT = 2_000
+
+
+def _history(size: int) -> list:
+    now = datetime.now()
+    rows = []
+    for text_id in random.sample(range(WORDS), size):
+        shown = random.randint(1, 30)
+        rows.append((text_id, shown, random.randint(0, shown), now - timedelta(hours=random.randint(0, 24 * 60))))
+    return rows
+
+
+def _timeit(fn) -> tuple[float, float]:
+    took = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        took.append((time.perf_counter() - start) * 1000)
+    took.sort()
+    return statistics.median(took), took[int(len(took) * 0.99) - 1]
+
+
+if __name__ == "__main__":
+    vocab = make_vocabulary(WORDS)
+
+    u50, u99 = _timeit(lambda: draw_groups(vocab, PROBLEMS, CANDIDATES))
+    print(f"uniform              draw p50 {u50:6.3f}ms p99 {u99:6.3f}ms")
+
+    for size in HISTORIES:
+        rows = _history(size)
+
+        start = time.perf_counter()
+        weights = UserWeights.from_stats(rows, datetime.now())
+        build_ms = (time.perf_counter() - start) * 1000
+
+        a50, a99 = _timeit(lambda: draw_groups(vocab, PROBLEMS, CANDIDATES, weights.answer_picker(vocab)))
+        print(
+            f"history {size:>6,} build {build_ms:7.1f}ms (캐시됨) "
+            f"draw p50 {a50:6.3f}ms p99 {a99:6.3f}ms"
+        )
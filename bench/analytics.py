@@ -0,0 +1,78 @@
+"""
+TestAnalyzer(열 단위 + numpy) 와 문제지를 하나씩 Paper로 되살려서 세는 방식을 비교합니다.
+
+    python -m bench.analytics
+
+DB 없이 가짜 단어장(5천 단어)과 v2 문제지 10만장(학생 1천명, 20문제 x 4보기)으로 측정합니다.
+하나씩 되살리는 방식은 너무 느려서 1만장만 돌리고 10만장으로 환산합니다.
+"""
+import random
+import time
+import uuid
+from collections import defaultdict
+
+from app.factory.codec import decode_paper
+from app.managers.analyzer import PaperColumns, TestAnalyzer
+from bench._papers import make_vocabulary
+
+PAPERS, STUDENTS, WORDS = 100_000, 1_000, 5_000
+PROBLEMS, CANDIDATES = 20, 4
+NAIVE_PAPERS = 10_000
+
+
+def _value(user_id: uuid.UUID) -> dict:
+    texts = random.sample(range(WORDS), PROBLEMS * CANDIDATES)
+    answers = [random.randrange(CANDIDATES) for _ in range(PROBLEMS)]
+    return {
+        "v": 2,
+        "id": str(uuid.uuid4()),
+        "b": {"id": str(user_id), "name": "bench", "user_name": "bench", "user_nickname": "bench", "user_type": "student"},
+        "p": [uuid.uuid4().hex for _ in range(PROBLEMS)],
+        "i": list(range(PROBLEMS)),
+        "d": [random.randrange(3) for _ in range(PROBLEMS)],
+        "q": [0] * PROBLEMS,
+        "t": [texts[i * CANDIDATES:(i + 1) * CANDIDATES] for i in range(PROBLEMS)],
+        "a": answers,
+        # 70% 정도 맞춤
+        "k": [a if random.random() < 0.7 else (a + 1) % CANDIDATES for a in answers],
+    }
+
+
+def _naive(rows, vocab) -> None:
+    """ 예전 방식: 문제지마다 Paper를 만들고 파이썬 dict로 셈 """
+    scores = defaultdict(list)
+    words = defaultdict(lambda: [0, 0])
+    for user_id, score, value in rows:
+        paper = decode_paper(value, vocab)
+        scores[user_id].append(paper.calculate_score())
+        for p in paper.problems:
+            counted = words[p.get_answer_obj().text.id]
+            counted[0] += 1
+            counted[1] += not p.corrected
+    {user_id: sum(s) / len(s) for user_id, s in scores.items()}
+
+
+if __name__ == "__main__":
+    vocab = make_vocabulary(WORDS)
+    students = [uuid.uuid4() for _ in range(STUDENTS)]
+
+    start = time.perf_counter()
+    rows = [(u, None, _value(u)) for u in random.choices(students, k=PAPERS)]
+    print(f"문제지 {PAPERS:,}장 생성 {time.perf_counter() - start:6.2f}s")
+
+    start = time.perf_counter()
+    columns = PaperColumns.from_rows(rows)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = TestAnalyzer(None).analyze(columns, vocab) # type: ignore
+    analyze_s = time.perf_counter() - start
+    print(
+        f"columnar  load {load_s:6.2f}s  aggregate {analyze_s * 1000:8.1f}ms  "
+        f"(학생 {len(result.students):,}명, 단어 {len(result.words)}개, 문제 {result.problem_count:,}개)"
+    )
+
+    start = time.perf_counter()
+    _naive(rows[:NAIVE_PAPERS], vocab)
+    naive_s = (time.perf_counter() - start) * PAPERS / NAIVE_PAPERS
+    print(f"naive     {naive_s:6.2f}s (1만장 측정 후 환산)")
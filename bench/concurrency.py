@@ -0,0 +1,56 @@
+"""
+uvicorn 워커 하나에 동시 요청을 보내고 처리량과 지연시간을 측정합니다.
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python -m bench.concurrency http://localhost:8000 <access_token>
+
+비교하려면 async DB 레이어 적용 전/후 커밋에서 서버를 각각 띄워 같은 명령을 실행합니다.
+"""
+import asyncio
+import sys
+import time
+
+from bench._http import request, percentile
+
+ENDPOINTS = [
+    "/api/v1/users/me",
+    "/api/v1/results/meta/me",
+]
+CONCURRENCY = [1, 8, 32, 128]
+REQUESTS = 1000
+
+
+async def run(base: str, token: str, path: str, concurrency: int) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    queue = asyncio.Queue()
+    for _ in range(REQUESTS):
+        queue.put_nowait(None)
+
+    took, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            status, _, ms = await request(base + path, headers=headers)
+            took.append(ms)
+            errors += status != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{path:<28} c={concurrency:<4} {REQUESTS / elapsed:8.1f} req/s "
+        f"p50 {percentile(took, 0.5):7.1f}ms p99 {percentile(took, 0.99):7.1f}ms errors {errors}"
+    )
+
+
+async def main(base: str, token: str) -> None:
+    for path in ENDPOINTS:
+        for concurrency in CONCURRENCY:
+            await run(base, token, path, concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], sys.argv[2]))
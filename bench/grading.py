@@ -0,0 +1,76 @@
+"""
+채점(apply_changes + calculate_score)과 시험지 만들기(to_test_version)의 비용을 잽니다.
+
+    python -m bench.grading
+
+legacy는 예전 방식(문제마다 Problem.set_checked로 보기를 훑고, 속성마다 정답을 다시 찾음)을 그대로 옮긴 것입니다.
+"""
+import time
+import statistics
+
+from app.schemas import Paper
+from bench._papers import make_paper
+
+SIZES = [20, 100, 500]
+CANDIDATES = 4
+REPEAT = 200
+
+
+def _timeit(fn) -> tuple[float, float]:
+    took = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        took.append((time.perf_counter() - start) * 1000)
+    took.sort()
+    return statistics.median(took), took[int(len(took) * 0.99) - 1]
+
+
+def _legacy_answer(p):
+    for c in p.candidates:
+        if c.answer is True:
+            return c
+    raise ValueError("정답이 없습니다.")
+
+
+def legacy_grade(paper: Paper, checked_map: dict) -> float:
+    for p in paper.problems:
+        checked = checked_map.get(p.u_id)
+        if checked is not None:
+            for c in p.candidates:
+                c.checked = c.u_id == checked
+
+    weights = {"easy": 1, "moderate": 2, "hard": 3}
+    total = sum(weights.get(p.difficulty.value, 2) for p in paper.problems)
+    return sum(
+        weights.get(p.difficulty.value, 2) / total * 100
+        for p in paper.problems if _legacy_answer(p).checked
+    )
+
+
+def run(problems: int) -> None:
+    paper = make_paper(problems, CANDIDATES, checked=False)
+    test_paper = paper.to_test_version(test_id=paper.id)
+    for qa in test_paper.q_a_set:
+        qa.answers[0].checked = True
+    checked_map = test_paper.checked_map()
+
+    def grade():
+        test_paper.apply_changes(paper).calculate_score()
+
+    rows = [
+        ("grade   legacy ", lambda: legacy_grade(paper, checked_map)),
+        ("grade   indexed", grade),
+        ("checked_map    ", test_paper.checked_map),
+        ("to_test_version", lambda: paper.to_test_version(test_id=paper.id)),
+    ]
+
+    print(f"{problems} x {CANDIDATES}")
+    for label, fn in rows:
+        p50, p99 = _timeit(fn)
+        print(f"    {label} p50 {p50:7.3f}ms p99 {p99:7.3f}ms")
+
+
+if __name__ == "__main__":
+    for problems in SIZES:
+        run(problems)
@@ -0,0 +1,68 @@
+"""
+로그인이 몰리는 동안 다른 API의 지연시간을 측정합니다.
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python -m bench.login_storm http://localhost:8000 <user_name> <password>
+
+1. 로그인 없이 /users/me 를 PROBES번 호출해서 p50, p99 측정
+2. LOGINS개의 로그인 루프를 돌리는 동안 같은 측정을 반복
+"""
+import asyncio
+import json
+import sys
+from urllib.parse import urlencode
+
+from bench._http import request, percentile
+
+LOGINS = 64
+PROBES = 300
+FORM = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+async def sign_in(base: str, name: str, password: str) -> tuple[int, bytes, float]:
+    body = urlencode({"username": name, "password": password}).encode()
+    return await request(f"{base}/api/v1/users/sign_in", "POST", FORM, body)
+
+
+async def probe(base: str, token: str) -> list[float]:
+    headers = {"Authorization": f"Bearer {token}"}
+    took = []
+    for _ in range(PROBES):
+        _, _, ms = await request(f"{base}/api/v1/users/me", headers=headers)
+        took.append(ms)
+    return took
+
+
+async def main(base: str, name: str, password: str) -> None:
+    status, body, _ = await sign_in(base, name, password)
+    if status != 200:
+        raise SystemExit(f"로그인 실패: {status} {body!r}")
+    token = json.loads(body)["access_token"]
+
+    quiet = await probe(base, token)
+    print(f"idle         /users/me p50 {percentile(quiet, 0.5):7.1f}ms p99 {percentile(quiet, 0.99):7.1f}ms")
+
+    stop = asyncio.Event()
+    logins, rejected = [], 0
+
+    async def storm():
+        nonlocal rejected
+        while not stop.is_set():
+            status, _, ms = await sign_in(base, name, password)
+            logins.append(ms)
+            rejected += status == 503
+
+    storms = [asyncio.create_task(storm()) for _ in range(LOGINS)]
+    busy = await probe(base, token)
+    stop.set()
+    await asyncio.gather(*storms)
+
+    print(f"login storm  /users/me p50 {percentile(busy, 0.5):7.1f}ms p99 {percentile(busy, 0.99):7.1f}ms")
+    print(
+        f"             sign_in   p50 {percentile(logins, 0.5):7.1f}ms p99 {percentile(logins, 0.99):7.1f}ms "
+        f"({len(logins)} logins, {rejected} rejected with 503)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*sys.argv[1:4]))
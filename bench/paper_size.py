@@ -0,0 +1,52 @@
+"""
+PaperStore.value 에 저장되는 문제지의 크기와 되살리는 시간을 v1 / v2 형식으로 비교합니다.
+
+    python -m bench.paper_size
+
+DB 없이 가짜 단어장으로 측정합니다.
+- v1: Paper.model_dump(mode="json")
+- v2 (legacy): 보기 u_id가 랜덤인 예전 문제지를 v2로 바꾼 것 ("c" 포함)
+- v2: candidate_u_id로 보기 u_id를 만든 새 문제지
+"""
+import json
+import time
+
+from app.factory.codec import decode_paper, encode_paper
+from app.factory.vocabulary import Vocabulary
+from bench._papers import make_paper, make_vocabulary
+
+SHAPES = [(20, 4), (50, 4), (100, 5)]
+REPEAT = 200
+
+
+def _size(value: dict) -> int:
+    # JSONB 저장 크기와 비슷하게 공백 없이 직렬화
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def _decode_ms(value: dict, vocab: Vocabulary) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        decode_paper(value, vocab)
+    return (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def run(problems: int, candidates: int) -> None:
+    vocab = make_vocabulary(problems * candidates)
+
+    v1 = make_paper(problems, candidates).model_dump(mode="json")
+    legacy = encode_paper(make_paper(problems, candidates, derived_u_ids=False))
+    v2 = encode_paper(make_paper(problems, candidates))
+
+    v1_bytes, legacy_bytes, v2_bytes = _size(v1), _size(legacy), _size(v2)
+    print(
+        f"{problems:>4} x {candidates} "
+        f"v1 {v1_bytes:>7,}B {_decode_ms(v1, vocab):6.2f}ms | "
+        f"v2(legacy) {legacy_bytes:>6,}B ({legacy_bytes / v1_bytes:5.1%}) {_decode_ms(legacy, vocab):6.2f}ms | "
+        f"v2 {v2_bytes:>6,}B ({v2_bytes / v1_bytes:5.1%}) {_decode_ms(v2, vocab):6.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    for problems, candidates in SHAPES:
+        run(problems, candidates)
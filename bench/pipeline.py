@@ -0,0 +1,56 @@
+"""
+ProblemFactory.run_pipeline 의 시간과 메모리를 문제지 크기별로 잽니다.
+
+    python -m bench.pipeline
+
+DB 없이 가짜 단어(2만개)를 texts로 넘겨서 MemorySampler로 뽑습니다.
+메모리는 tracemalloc으로 잰 한장을 만드는 동안의 최대 할당량(peak)과 만들어진 문제지의 크기(kept)입니다.
+"""
+import time
+import statistics
+import tracemalloc
+
+from sqlmodel import Session, create_engine
+
+from app.factory.problem import ProblemFactory
+from bench._papers import make_texts
+
+SIZES = [20, 200, 2000]
+CANDIDATES = 4
+WORDS = 20_000
+REPEAT = 30
+
+
+def run(db: Session, texts, problems: int) -> None:
+    # 단어장(Vocabulary.from_texts)을 만드는 비용은 빼고 run_pipeline만 잼
+    def factory() -> ProblemFactory:
+        return ProblemFactory(db, texts=texts, candidate_limit=CANDIDATES, problems_count=problems)
+
+    took = []
+    for _ in range(REPEAT):
+        at_factory = factory()
+        start = time.perf_counter()
+        exported = at_factory.run_pipeline()
+        took.append((time.perf_counter() - start) * 1000)
+        assert exported is not None and len(exported.problems) == problems
+    took.sort()
+
+    at_factory = factory()
+    tracemalloc.start()
+    exported = at_factory.run_pipeline()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{problems:5d} x {CANDIDATES} "
+        f"p50 {statistics.median(took):8.2f}ms p99 {took[int(len(took) * 0.99) - 1]:8.2f}ms "
+        f"peak {peak / 2**20:6.2f}MB kept {kept / 2**20:6.2f}MB"
+    )
+
+
+if __name__ == "__main__":
+    texts = make_texts(WORDS)
+    # MemorySampler만 쓰므로 연결하지 않는 세션
+    with Session(create_engine("sqlite://")) as db:
+        for problems in SIZES:
+            run(db, texts, problems)
@@ -0,0 +1,76 @@
+"""
+제출(submit)과 결과 조회(result/specific)에서 저장된 문제지를 되살리는 비용을 비교합니다.
+
+    python -m bench.rehydration
+
+DB 없이 가짜 단어장과 문제지로 측정합니다.
+- submit
+    validate: Paper.model_validate + model_validate_to_end + apply_changes + calculate_score + model_dump
+    view: PaperView.set_checked + calculate_score + to_value (Text를 만들지 않음)
+- result
+    validate: Paper.model_validate + model_validate_to_end
+    construct: decode_paper (model_construct, v1 / v2)
+"""
+import copy
+import time
+import statistics
+
+from app.schemas import Paper
+from app.factory.codec import PaperView, decode_paper, encode_paper
+from bench._papers import make_paper, make_vocabulary
+
+SHAPES = [(20, 4), (100, 5)]
+REPEAT = 300
+
+
+def _timeit(fn) -> tuple[float, float]:
+    took = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        took.append((time.perf_counter() - start) * 1000)
+    took.sort()
+    return statistics.median(took), took[int(len(took) * 0.99) - 1]
+
+
+def run(problems: int, candidates: int) -> None:
+    vocab = make_vocabulary(problems * candidates)
+    paper = make_paper(problems, candidates, checked=False)
+    test_paper = paper.to_test_version(test_id=paper.id)
+    for qa in test_paper.q_a_set:
+        qa.answers[0].checked = True
+    checked_map = test_paper.checked_map()
+
+    v1 = paper.model_dump(mode="json")
+    v2 = encode_paper(paper)
+
+    def submit_validate():
+        changed = test_paper.apply_changes(Paper.model_validate(v1).model_validate_to_end())
+        changed.calculate_score()
+        changed.model_dump(mode="json")
+
+    def submit_view(value):
+        view = PaperView(value).set_checked(checked_map)
+        view.calculate_score()
+        view.to_value()
+
+    # 실제 요청은 매번 DB에서 새 dict를 읽으므로 view 쪽은 복사본으로 측정 (복사 비용은 마지막 줄)
+    rows = [
+        ("submit  validate (v1)", submit_validate),
+        ("submit  view     (v1)", lambda: submit_view(copy.deepcopy(v1))),
+        ("submit  view     (v2)", lambda: submit_view(copy.deepcopy(v2))),
+        ("result  validate (v1)", lambda: Paper.model_validate(v1).model_validate_to_end()),
+        ("result  construct(v1)", lambda: decode_paper(v1)),
+        ("result  construct(v2)", lambda: decode_paper(v2, vocab)),
+        ("deepcopy         (v2)", lambda: copy.deepcopy(v2)),
+    ]
+
+    print(f"{problems} x {candidates}")
+    for label, fn in rows:
+        p50, p99 = _timeit(fn)
+        print(f"    {label} p50 {p50:7.3f}ms p99 {p99:7.3f}ms")
+
+
+if __name__ == "__main__":
+    for problems, candidates in SHAPES:
+        run(problems, candidates)
@@ -0,0 +1,82 @@
+"""
+문제지 응답의 전송 크기와 요청당 CPU 시간을 FastAPI 기본 경로와 fast_response로 비교합니다.
+
+    python -m bench.responses
+
+DB 없이 ASGI 앱을 직접 호출하므로 라우팅/직렬화/압축 비용만 측정됩니다.
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+
+from app.core.responses import fast_response
+from app.schemas import GetPaperResponse, GetTestPaperResponse
+from bench._papers import make_paper
+
+REQUESTS = 500
+
+paper = make_paper(20, 4)
+test_paper = paper.to_test_version(test_id=paper.id)
+
+app = FastAPI()
+
+
+@app.get("/default/paper", response_model=GetPaperResponse)
+async def default_paper():
+    return GetPaperResponse(paper=paper)
+
+
+@app.get("/default/test", response_model=GetTestPaperResponse)
+async def default_test():
+    return GetTestPaperResponse(paper=test_paper)
+
+
+@app.get("/fast/paper", response_model=GetPaperResponse)
+async def fast_paper(request: Request):
+    return fast_response(request, GetPaperResponse(paper=paper))
+
+
+@app.get("/fast/test", response_model=GetTestPaperResponse)
+async def fast_test(request: Request):
+    return fast_response(request, GetTestPaperResponse(paper=test_paper))
+
+
+async def call(path: str, accept: str) -> bytes:
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "scheme": "http", "http_version": "1.1",
+        "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [(b"host", b"bench"), (b"accept-encoding", accept.encode())],
+    }
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def main() -> None:
+    for kind in ("paper", "test"):
+        for path, accept in [
+            (f"/default/{kind}", "identity"),
+            (f"/fast/{kind}", "identity"),
+            (f"/fast/{kind}", "gzip"),
+            (f"/fast/{kind}", "br, gzip"),
+        ]:
+            size = len(await call(path, accept))
+            start = time.process_time()
+            for _ in range(REQUESTS):
+                await call(path, accept)
+            cpu_ms = (time.process_time() - start) / REQUESTS * 1000
+            print(f"{path:<15} {accept:<9} {size:>8,} bytes {cpu_ms:7.3f} ms cpu/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+메모리 추출(MemorySampler)과 DB 추출(DatabaseSampler)을 비교합니다.
+
+    python -m bench.sampling
+
+Text 테이블에 1만 ~ 1천만 개의 임시 단어를 넣고 (마지막에 rollback 됨)
+- memory: 단어장 적재 시간(캐시 갱신 1회 비용) + 문제지 1장(20문제 x 4보기) 추출 시간
+- database: 문제지 1장 추출 시간 (빽빽한 id / 듬성듬성한 id)
+을 출력합니다.
+"""
+import time
+import statistics
+
+from sqlmodel import Session, text as sql_text
+
+from app.core.db import engine
+from app.schemas.enum import Tag
+from app.factory.vocabulary import VocabularyCache
+from app.factory.sampler import MemorySampler, DatabaseSampler, TextSampler, draw_groups
+
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+PROBLEMS, CANDIDATES = 20, 4
+K = PROBLEMS * CANDIDATES
+REPEAT = 50
+
+
+def _fill(s: Session, size: int, step: int) -> None:
+    s.exec(sql_text(
+        "INSERT INTO text (id, name, tag, k_description) "
+        "SELECT 1000000000 + g * :step, 'word' || g, :tag, '뜻' || g "
+        "FROM generate_series(1, :size) AS g"
+    ).bindparams(step=step, size=size, tag=Tag.NOUN.name)) # type: ignore
+    s.exec(sql_text("ANALYZE text")) # type: ignore
+
+
+def _timeit(fn) -> tuple[float, float]:
+    took = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        took.append((time.perf_counter() - start) * 1000)
+    took.sort()
+    return statistics.median(took), took[int(len(took) * 0.99) - 1]
+
+
+def _draw(sampler: TextSampler) -> None:
+    pool = sampler.pool(K)
+    for group in draw_groups(pool, PROBLEMS, CANDIDATES):
+        [pool.text(i) for i in group]
+
+
+def run(size: int, step: int) -> None:
+    with Session(engine) as s:
+        _fill(s, size, step)
+
+        start = time.perf_counter()
+        vocab = VocabularyCache()._load(s, ())
+        load_ms = (time.perf_counter() - start) * 1000
+        memory = MemorySampler(vocab)
+        m50, m99 = _timeit(lambda: _draw(memory))
+
+        d50, d99 = _timeit(lambda: _draw(DatabaseSampler(s)))
+
+        label = "dense" if step == 1 else f"sparse(x{step})"
+        print(
+            f"{size:>10,} {label:<12} "
+            f"memory load {load_ms:9.1f}ms sample p50 {m50:6.2f}ms p99 {m99:6.2f}ms | "
+            f"database sample p50 {d50:6.2f}ms p99 {d99:6.2f}ms"
+        )
+        s.rollback()
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        for step in (1, 10):
+            run(size, step)
@@ -0,0 +1,49 @@
+"""
+score_papers(배열 한번에 채점)와 문제지마다 PaperView.calculate_score를 부르는 방식을 비교합니다.
+
+    python -m bench.scoring
+
+문제지 100만장 (20문제, 난이도/정답 여부는 랜덤) 을 가중치를 바꿔가며 다시 채점합니다.
+문제지마다 부르는 방식은 너무 느려서 1만장만 돌리고 100만장으로 환산합니다.
+"""
+import time
+
+import numpy as np
+
+from app.factory.codec import PaperView
+from app.factory.scoring import paper_index_from_counts, score_papers
+
+PAPERS, PROBLEMS = 1_000_000, 20
+LOOP_PAPERS = 10_000
+WEIGHTS = [(1, 2, 3), (1, 1, 1), (1, 3, 9)]
+
+
+def _value(difficulty: np.ndarray, correct: np.ndarray) -> dict:
+    """ calculate_score에 필요한 필드만 있는 v2 문제지 """
+    return {"v": 2, "d": difficulty.tolist(), "a": [0] * len(correct), "k": [0 if c else -1 for c in correct.tolist()]}
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    paper_index = paper_index_from_counts(np.full(PAPERS, PROBLEMS))
+    difficulty = rng.integers(0, 3, size=PAPERS * PROBLEMS, dtype=np.int8)
+    correct = rng.random(PAPERS * PROBLEMS) < 0.7
+    print(f"{PAPERS} papers x {PROBLEMS} problems, arrays {(paper_index.nbytes + difficulty.nbytes + correct.nbytes) / 2**20:.0f}MB")
+
+    for weights in WEIGHTS:
+        start = time.perf_counter()
+        scores = score_papers(paper_index, difficulty, correct, PAPERS, weights)
+        took = time.perf_counter() - start
+        print(f"    vectorized weights={weights} {took * 1000:8.1f}ms mean {scores.mean():.2f}")
+
+    values = [
+        _value(difficulty[i * PROBLEMS:(i + 1) * PROBLEMS], correct[i * PROBLEMS:(i + 1) * PROBLEMS])
+        for i in range(LOOP_PAPERS)
+    ]
+    start = time.perf_counter()
+    looped = [PaperView(v).calculate_score() for v in values]
+    took = (time.perf_counter() - start) * PAPERS / LOOP_PAPERS
+    print(f"    per-paper  weights=settings {took * 1000:8.1f}ms (환산)")
+
+    m = LOOP_PAPERS * PROBLEMS
+    assert np.allclose(looped, score_papers(paper_index[:m], difficulty[:m], correct[:m], LOOP_PAPERS))
@@ -0,0 +1,85 @@
+"""
+app.core.config.Settings 는 import 할때 필수 환경변수를 읽으므로 테스트용 값을 먼저 넣어둡니다.
+테스트는 DB에 연결하지 않습니다. (엔진은 만들어지지만 쿼리를 하지 않음)
+가짜 단어/문제지는 make_texts, make_paper fixture로 만듭니다.
+
+    python -m pytest -q
+"""
+import os
+
+for name, value in {
+    "PROJECT_NAME": "vocabs-test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "FIRST_SUPERUSER": "admin@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "test-password",
+    "PEPPER": "test-pepper",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+import random # noqa: E402
+import uuid # noqa: E402
+from typing import List # noqa: E402
+
+import pytest # noqa: E402
+
+from app.schemas import Candidate, Paper, Problem, Tag, Text, UserDTO # noqa: E402
+from app.schemas.problem import candidate_u_id # noqa: E402
+
+
+def _make_texts(count: int) -> List[Text]:
+    tags = list(Tag)
+    return [
+        Text(id=i, name=f"word{i}", tag=random.choice(tags), k_description=f"단어{i}의 뜻")
+        for i in range(count)
+    ]
+
+
+def _make_paper(
+    problems: int = 20,
+    candidates: int = 4,
+    checked: bool = True,
+    derived_u_ids: bool = True,
+) -> Paper:
+    """ DB 없이 만든 문제지. derived_u_ids=False 이면 보기 u_id를 랜덤으로 만듦 (v1 시절 문제지) """
+    texts = iter(_make_texts(problems * candidates))
+
+    made = []
+    for i in range(problems):
+        problem_u_id = uuid.uuid4()
+        answer = random.randrange(candidates)
+        picked = random.randrange(candidates) if checked else -1
+        made.append(Problem(
+            id=i,
+            u_id=problem_u_id,
+            candidates=[
+                Candidate(
+                    id=j,
+                    u_id=candidate_u_id(problem_u_id, j) if derived_u_ids else uuid.uuid4(),
+                    text=next(texts),
+                    answer=(j == answer),
+                    checked=(j == picked),
+                )
+                for j in range(candidates)
+            ],
+        ))
+
+    return Paper(
+        binded=UserDTO(),
+        answer_map={p.u_id: p.get_answer_obj().u_id for p in made},
+        problems=made,
+    )
+
+
+@pytest.fixture
+def make_texts():
+    return _make_texts
+
+
+@pytest.fixture
+def make_paper():
+    return _make_paper
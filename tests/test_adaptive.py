@@ -0,0 +1,87 @@
+"""
+AliasTable(가중치 추출)과 UserWeights(유저 기록 -> 정답 선택)를 확인합니다.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.schemas import Tag
+from app.factory.adaptive import AliasTable, UserWeights
+from app.factory.vocabulary import Vocabulary
+
+
+def _masses(table: AliasTable) -> list:
+    """ alias table이 뜻하는 각 인덱스의 확률 (난수 없이 계산) """
+    n = len(table)
+    masses = [table.prob[i] / n for i in range(n)]
+    for j in range(n):
+        masses[table.alias[j]] += (1 - table.prob[j]) / n
+    return masses
+
+
+@pytest.mark.parametrize("weights", [
+    [1.0],
+    [1.0, 1.0, 1.0, 1.0],
+    [1.0, 2.0, 3.0, 4.0],
+    [100.0, 0.5, 0.5, 0.0, 7.0],
+    [random.random() for _ in range(200)],
+])
+def test_alias_table_matches_weights(weights):
+    table = AliasTable(weights)
+    total = sum(weights)
+
+    assert len(table) == len(weights)
+    assert _masses(table) == pytest.approx([w / total for w in weights], abs=1e-9)
+
+
+def test_alias_table_never_draws_zero_weight():
+    table = AliasTable([0.0, 1.0, 0.0, 2.0])
+    assert {table.draw() for _ in range(2000)} <= {1, 3}
+
+
+def test_alias_table_empty():
+    assert len(AliasTable([])) == 0
+
+
+def test_from_stats():
+    now = datetime.now()
+    weights = UserWeights.from_stats(
+        [
+            (1, 10, 0, now - timedelta(days=30)),   # 다 틀렸고 오래됨 -> 가장 큼
+            (2, 10, 10, now - timedelta(days=30)),  # 다 맞았음
+            (3, 10, 0, now),                        # 방금 봤음 -> 0
+            (4, 1, 0, None),                        # 본 시각 없음 -> 복습시기 1
+        ],
+        now,
+    )
+    extras = dict(zip(weights.text_ids, _masses(weights.table)))
+
+    assert set(extras) == {1, 2, 4}
+    assert extras[1] > extras[4] > extras[2]
+    assert weights.total_extra > 0
+
+
+def _pool(count: int) -> Vocabulary:
+    return Vocabulary(
+        ids=list(range(count)),
+        names=[f"word{i}" for i in range(count)],
+        tags=[Tag.NOUN] * count,
+        k_descriptions=[f"뜻{i}" for i in range(count)],
+    )
+
+
+def test_answer_picker_skips_used_and_unknown_words():
+    pool = _pool(10)
+    # 99는 단어장에 없는 단어
+    weights = UserWeights([3, 5, 99], [1000.0, 1000.0, 1000.0])
+    pick = weights.answer_picker(pool)
+
+    picked = {pick({pool.positions[3]}) for _ in range(500)}
+    assert picked <= {pool.positions[5], None}
+    assert pool.positions[5] in picked
+
+
+def test_answer_picker_without_history():
+    pick = UserWeights([], []).answer_picker(_pool(10))
+    assert all(pick(set()) is None for _ in range(100))
@@ -0,0 +1,23 @@
+"""
+학생 이름 접두사 검색(User._students_stmt)의 LIKE 패턴을 확인합니다.
+"""
+import pytest
+
+from app.schemas.auth import User, like_prefix
+
+
+@pytest.mark.parametrize("prefix, pattern", [
+    ("김", "김%"),
+    ("50%", "50\\%%"),
+    ("a_b", "a\\_b%"),
+    ("a\\b", "a\\\\b%"),
+])
+def test_like_prefix_escapes_wildcards(prefix, pattern):
+    assert like_prefix(prefix) == pattern
+
+
+def test_students_stmt_has_no_escape_clause():
+    # ESCAPE 절이 붙으면 플래너가 접두사를 인덱스 범위로 바꾸지 못함
+    compiled = User._students_stmt("a_b", 10, None).compile()
+    assert "ESCAPE" not in str(compiled)
+    assert "a\\_b%" in compiled.params.values()
@@ -0,0 +1,145 @@
+"""
+저장 형식(v1/v2) 인코딩, 디코딩과 PaperView 의 채점이 형식과 상관없이 같은지 확인합니다.
+"""
+import copy
+import random
+import uuid
+
+import pytest
+
+from app.schemas import Difficulty, Paper
+from app.factory.codec import VERSION, PaperView, decode_paper, encode_paper
+from app.factory.vocabulary import Vocabulary
+
+
+def _vocab(paper: Paper) -> Vocabulary:
+    return Vocabulary.from_texts([c.text for p in paper.problems for c in p.candidates])
+
+
+def _mixed_paper(make_paper, **kwargs) -> Paper:
+    paper = make_paper(**kwargs)
+    for p in paper.problems:
+        p.difficulty = random.choice(list(Difficulty))
+    return paper
+
+
+def _shape(paper: Paper) -> list:
+    """ 비교용: 문제/보기의 저장되는 값들 """
+    return [
+        (
+            p.id, p.u_id, p.difficulty, p.question_type,
+            [(c.id, c.u_id, c.text.id, c.text.name, c.text.k_description, c.answer, c.checked) for c in p.candidates],
+        )
+        for p in paper.problems
+    ]
+
+
+def _checked_map(paper: Paper) -> dict:
+    """ 문제마다 임의의 보기를 체크한 TestPaper.checked_map() """
+    return {p.u_id: random.choice(p.candidates).u_id for p in paper.problems}
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_v2_round_trip(make_paper, checked):
+    paper = _mixed_paper(make_paper, problems=20, candidates=4, checked=checked)
+
+    value = encode_paper(paper)
+    assert value["v"] == VERSION
+    assert "c" not in value
+
+    decoded = decode_paper(value, _vocab(paper))
+    assert decoded.id == paper.id
+    assert decoded.binded == paper.binded
+    # 저장된 문제지(v1 포함)와 같이 answer_map은 문자열 키/값
+    assert decoded.answer_map == {str(k): str(v) for k, v in paper.answer_map.items()}
+    assert _shape(decoded) == _shape(paper)
+
+
+def test_v2_keeps_random_candidate_u_ids(make_paper):
+    paper = make_paper(problems=5, candidates=4, derived_u_ids=False)
+
+    value = encode_paper(paper)
+    assert value["v"] == VERSION
+    assert "c" in value
+    assert _shape(decode_paper(value, _vocab(paper))) == _shape(paper)
+
+
+def test_falls_back_to_v1(make_paper):
+    paper = make_paper(problems=5, candidates=4, checked=False)
+    # 체크가 두개인 문제는 v2로 표현할 수 없음
+    for c in paper.problems[0].candidates[:2]:
+        c.checked = True
+
+    value = encode_paper(paper)
+    assert "v" not in value
+    assert value == paper.model_dump(mode="json")
+    assert _shape(decode_paper(value)) == _shape(paper)
+
+
+def test_unknown_version():
+    with pytest.raises(ValueError):
+        PaperView({"v": VERSION + 1})
+
+
+def test_missing_word(make_paper):
+    paper = make_paper(problems=5, candidates=4)
+    vocab = _vocab(paper)
+    missing = Vocabulary(vocab.ids[1:], vocab.names[1:], vocab.tags[1:], vocab.k_descriptions[1:])
+
+    with pytest.raises(ValueError):
+        decode_paper(encode_paper(paper), missing)
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_v1_v2_agree(make_paper, checked):
+    paper = _mixed_paper(make_paper, problems=20, candidates=4, checked=checked)
+    v1 = PaperView(paper.model_dump(mode="json"))
+    v2 = PaperView(encode_paper(paper))
+
+    assert v1.calculate_score() == v2.calculate_score() == paper.calculate_score()
+    assert v1.answer_results() == v2.answer_results()
+    assert v1.get_p_counts() == v2.get_p_counts() == paper.get_p_counts()
+    assert v1.id == v2.id == paper.id
+
+    checked_map = _checked_map(paper)
+    v1.set_checked(checked_map)
+    v2.set_checked(checked_map)
+    expected = copy.deepcopy(paper).set_checked(checked_map)
+
+    assert v1.calculate_score() == v2.calculate_score() == expected.calculate_score()
+    assert v1.answer_results() == v2.answer_results()
+    assert _shape(decode_paper(v2.to_value(), _vocab(paper))) == _shape(expected)
+    assert _shape(decode_paper(v1.to_value())) == _shape(expected)
+
+
+def test_set_checked_unknown_candidate_unchecks(make_paper):
+    """ 문제지에 없는 보기를 체크하면 그 문제는 체크가 없어짐 (Problem.set_checked와 같음) """
+    paper = make_paper(problems=3, candidates=4, checked=True)
+    target = paper.problems[0].u_id
+    view = PaperView(encode_paper(paper)).set_checked({target: uuid.uuid4()})
+
+    assert view.value["k"][0] == -1
+    assert not any(c.checked for c in paper.set_checked({target: uuid.uuid4()}).problems[0].candidates)
+
+
+def test_score_is_rounded(make_paper):
+    """ 가중치 나눗셈의 부동소수점 오차가 점수에 남지 않음 (예: 20문제 중 11개 -> 55.0) """
+    paper = make_paper(problems=20, candidates=4, checked=False)
+    for p in paper.problems[:11]:
+        p.get_answer_obj().checked = True
+
+    assert paper.calculate_score() == 55.0
+    assert PaperView(encode_paper(paper)).calculate_score() == 55.0
+
+
+def test_v1_view_does_not_build_paper(make_paper, monkeypatch):
+    """ v1도 채점/제출 반영은 저장된 dict만 읽음 (Paper는 to_paper에서만 만듦) """
+    paper = _mixed_paper(make_paper, problems=5, candidates=4, checked=False)
+    monkeypatch.setattr("app.factory.codec._construct_v1", lambda value: pytest.fail("Paper를 만들면 안됨"))
+
+    view = PaperView(paper.model_dump(mode="json"))
+    view.set_checked(_checked_map(paper))
+    view.calculate_score()
+    view.answer_results()
+    assert view.binded == paper.binded
+    assert view.to_value() is view.value
@@ -0,0 +1,28 @@
+"""
+Accept-Encoding 해석과 압축 인코딩 선택을 확인합니다. (빠른 응답 경로와 정적 파일이 같이 씀)
+"""
+import pytest
+
+from app.core.encoding import choose_encoding, parse_accept_encoding
+
+
+def test_parse_q_values():
+    assert parse_accept_encoding("gzip, deflate, br;q=0") == {"gzip": 1.0, "deflate": 1.0, "br": 0.0}
+    assert parse_accept_encoding("BR;Q=0.5, gzip;q=bad, *;q=0.1") == {"br": 0.5, "gzip": 0.0, "*": 0.1}
+    assert parse_accept_encoding("") == {}
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip, br;q=0", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("br;q=0.2, gzip;q=0.8", "gzip"),
+    ("*", "br"),
+    ("*;q=0.5, br;q=0", "gzip"),
+    ("identity", None),
+    # 다른 토큰 안에 들어있는 글자는 무시
+    ("x-gzipped, abr", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header, ("br", "gzip")) == expected
@@ -0,0 +1,67 @@
+"""
+GET /papers/paper 가 요청한 크기의 문제지를 주고, 단어가 모자란 크기는 400으로 거절하는지 확인합니다.
+DB와 문제지 풀 대신 make_exportation을 가짜 단어로 바꾸고, 저장(PaperStore.aput)은 기록만 합니다.
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, create_engine
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.factory.problem import ProblemFactory
+from app.routers import paper as paper_router
+from app.schemas import PaperStore, User, UType
+
+WORDS = 1000
+
+
+@pytest.fixture
+def stored(monkeypatch, make_texts):
+    texts = make_texts(WORDS)
+
+    def make_exportation(weights, problems_count, candidate_limit):
+        with Session(create_engine("sqlite://")) as s:
+            factory = ProblemFactory(s, texts=texts, candidate_limit=candidate_limit, problems_count=problems_count)
+            return factory.adapt(weights).run_pipeline()
+
+    calls = []
+
+    async def aput(db, namespace, key, value, problem_count=None):
+        calls.append(problem_count)
+
+    monkeypatch.setattr(paper_router, "make_exportation", make_exportation)
+    monkeypatch.setattr(PaperStore, "aput", staticmethod(aput))
+    monkeypatch.setattr(paper_router.paper_pool, "take", lambda: None)
+    monkeypatch.setattr(settings, "FAST_RESPONSES", False)
+    return calls
+
+
+def _get_paper(problems_count: int, candidate_limit: int):
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    me = User(name="student", user_type=UType.STUDENT)
+    return asyncio.run(paper_router.get_paper(
+        request,
+        problems_count=problems_count,
+        candidate_limit=candidate_limit,
+        me=me,
+        db=None, # type: ignore
+    ))
+
+
+def test_non_default_size(stored):
+    response = _get_paper(problems_count=200, candidate_limit=3)
+
+    assert len(response.paper.q_a_set) == 200
+    assert all(len(qa.answers) == 3 for qa in response.paper.q_a_set)
+    assert stored == [200]
+
+
+def test_oversized_paper_is_400(stored):
+    # 500문제 x 4개 보기 = 2000 단어 > WORDS
+    with pytest.raises(HTTPException) as e:
+        _get_paper(problems_count=settings.PAPER_PROBLEMS_MAX, candidate_limit=4)
+
+    assert e.value.status_code == 400
+    assert stored == []
@@ -0,0 +1,43 @@
+"""
+ProblemFactory(texts=...)가 요청한 크기의 문제지를 만드는지, 만들 수 없는 크기는 거절하는지 확인합니다.
+"""
+import pytest
+from sqlmodel import Session, create_engine
+
+from app.factory.problem import InvalidProblem, ProblemFactory
+
+
+@pytest.fixture
+def db():
+    # texts를 넘기면 DB를 조회하지 않음 (ProblemFactory가 세션을 요구해서 연결 없는 세션을 넘김)
+    with Session(create_engine("sqlite://")) as s:
+        yield s
+
+
+@pytest.mark.parametrize("problems, candidates", [(1, 2), (20, 4), (200, 4), (50, 6)])
+def test_pipeline_shape(db, make_texts, problems, candidates):
+    texts = make_texts(problems * candidates * 2)
+    exported = ProblemFactory(db, texts=texts, candidate_limit=candidates, problems_count=problems).run_pipeline()
+
+    assert exported is not None
+    assert len(exported.problems) == problems
+    assert all(len(p.candidates) == candidates for p in exported.problems)
+    # 문제마다 정답은 하나이고 answer_map이 그 보기를 가리킴
+    for p in exported.problems:
+        answers = [c for c in p.candidates if c.answer]
+        assert len(answers) == 1
+        assert exported.answer_map[p.u_id] == answers[0].u_id
+
+    text_ids = [c.text.id for p in exported.problems for c in p.candidates]
+    assert len(text_ids) == len(set(text_ids))
+
+
+@pytest.mark.parametrize("problems, candidates", [(0, 4), (-1, 4), (20, 1), (20, 0)])
+def test_invalid_size(db, make_texts, problems, candidates):
+    with pytest.raises(InvalidProblem):
+        ProblemFactory(db, texts=make_texts(100), candidate_limit=candidates, problems_count=problems)
+
+
+def test_not_enough_words(db, make_texts):
+    with pytest.raises(ValueError):
+        ProblemFactory(db, texts=make_texts(79), candidate_limit=4, problems_count=20)
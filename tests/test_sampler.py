@@ -0,0 +1,140 @@
+"""
+_SparseShuffle(비복원추출)과 iter_groups(문제별 보기 묶음)의 규칙,
+DatabaseSampler가 듬성듬성한 id 공간에서 바인드 파라미터를 폭주시키지 않는지 확인합니다.
+"""
+import itertools
+
+import pytest
+
+from app.schemas import Tag, Text
+from app.factory.sampler import DatabaseSampler, _SparseShuffle, draw_groups, iter_groups
+from app.factory.vocabulary import Vocabulary
+
+
+def _vocab(count: int, tags=(Tag.NOUN, Tag.VERB), shared_descs: int = 0) -> Vocabulary:
+    """ 단어 count개. 앞의 shared_descs개는 뜻이 모두 같음 """
+    return Vocabulary(
+        ids=[1000 + i for i in range(count)],
+        names=[f"word{i}" for i in range(count)],
+        tags=[tags[i % len(tags)] for i in range(count)],
+        k_descriptions=["같은 뜻" if i < shared_descs else f"뜻{i}" for i in range(count)],
+    )
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 50])
+def test_sparse_shuffle_draws_each_once(size):
+    bucket = list(range(100, 100 + size))
+    shuffler = _SparseShuffle(bucket)
+
+    drawn = [shuffler.draw() for _ in range(size)]
+    assert sorted(drawn) == bucket # type: ignore
+    assert shuffler.draw() is None
+    # bucket은 복사하거나 섞지 않음
+    assert bucket == list(range(100, 100 + size))
+
+
+def test_groups_shape_and_uniqueness():
+    vocab = _vocab(500)
+    groups = list(iter_groups(vocab, 20, 4))
+
+    assert len(groups) == 20
+    assert all(len(group) == 4 for group in groups)
+    flat = [i for group in groups for i in group]
+    assert len(flat) == len(set(flat))
+
+
+def test_wrongs_share_the_answer_tag():
+    vocab = _vocab(500)
+    for answer, *wrongs in iter_groups(vocab, 20, 4):
+        assert all(vocab.tags[w] == vocab.tags[answer] for w in wrongs)
+
+
+def test_no_shared_meaning_in_a_group():
+    vocab = _vocab(200, shared_descs=100)
+    for group in iter_groups(vocab, 20, 4):
+        codes = [vocab.desc_codes[i] for i in group]
+        assert len(codes) == len(set(codes))
+
+
+def test_falls_back_to_other_tags():
+    # 동사는 1개 뿐이므로 동사 정답의 오답은 다른 품사에서 채워야 함
+    vocab = Vocabulary(
+        ids=list(range(9)),
+        names=[f"word{i}" for i in range(9)],
+        tags=[Tag.VERB] + [Tag.NOUN] * 8,
+        k_descriptions=[f"뜻{i}" for i in range(9)],
+    )
+    groups = draw_groups(vocab, 2, 4, pick_answer=lambda used: 0 if 0 not in used else None)
+
+    assert groups[0][0] == 0
+    assert len({i for group in groups for i in group}) == 8
+
+
+def test_pick_answer_is_used():
+    vocab = _vocab(100)
+    wanted = iter([7, 42, 99])
+    groups = draw_groups(vocab, 3, 4, pick_answer=lambda used: next(wanted))
+
+    assert [group[0] for group in groups] == [7, 42, 99]
+
+
+def test_too_small_vocabulary():
+    with pytest.raises(ValueError):
+        draw_groups(_vocab(10), 3, 4)
+
+
+class _Result:
+    def __init__(self, rows) -> None:
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class _Session:
+    """ DatabaseSampler가 보내는 문장을 기록하고, id 조회에는 실제로 있는 id의 행만 돌려줌 """
+
+    def __init__(self, ids) -> None:
+        self.ids = set(ids)
+        self.in_sizes = []
+
+    def exec(self, stmt):
+        params = stmt.compile().params
+        probed = next((v for v in params.values() if isinstance(v, (list, tuple, set))), [])
+        self.in_sizes.append(len(probed))
+        return _Result([
+            Text(id=i, name=f"word{i}", tag=Tag.NOUN, k_description=f"뜻{i}")
+            for i in probed if i in self.ids
+        ])
+
+
+def _sampler(ids) -> DatabaseSampler:
+    """ __init__의 min/max, reltuples 조회 대신 값을 직접 넣은 DatabaseSampler """
+    sampler = DatabaseSampler.__new__(DatabaseSampler)
+    sampler.db_session = _Session(ids) # type: ignore
+    sampler._low, sampler._high = min(ids), max(ids)
+    sampler._estimated = len(ids)
+    return sampler
+
+
+def test_sparse_ids_skip_id_range(monkeypatch):
+    # 600개 + 멀리 떨어진 id 하나: id를 찍어보면 수백만개의 바인드 파라미터가 필요함
+    ids = list(range(1, 601)) + [10_000_000]
+    sampler = _sampler(ids)
+    fallback = []
+    monkeypatch.setattr(sampler, "_by_id_range", lambda need, seen: pytest.fail("id 범위 추출을 하면 안됨"))
+    monkeypatch.setattr(sampler, "_by_tablesample", lambda need, seen: fallback.append(need) or [])
+    monkeypatch.setattr(sampler, "_by_random_order", lambda need, seen: [])
+
+    sampler.sample(80)
+    assert fallback == [80]
+
+
+def test_id_range_probes_are_capped():
+    # 밀도 10%: 예전 식이면 need / 0.1 * 1.2 만큼 찍음
+    ids = list(itertools.islice(range(1, 1_000_000, 10), 50_000))
+    sampler = _sampler(ids)
+
+    picked = sampler._by_id_range(5000, set())
+    assert max(sampler.db_session.in_sizes) <= DatabaseSampler.max_guesses # type: ignore
+    assert {t.id for t in picked} <= set(ids)
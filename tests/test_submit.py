@@ -0,0 +1,32 @@
+"""
+큰 문제지(배치고사 200문제 등)의 점수가 /papers/submit 응답(PostSubmitResponse)으로 나갈 수 있는지 확인합니다.
+"""
+import random
+
+import pytest
+
+from app.schemas import Difficulty, PostSubmitResponse, UserDTO
+from app.schemas.test_paper import weighted_score
+from app.factory.codec import PaperView, encode_paper
+
+
+@pytest.mark.parametrize("problems", [20, 200, 500])
+def test_every_moderate_score_fits_the_response(problems):
+    # 모든 문제가 MODERATE(가중치 2)일때 가능한 모든 점수
+    for corrected in range(problems + 1):
+        score = weighted_score(corrected * 2, problems * 2)
+        assert score == round(score, 2)
+        assert PostSubmitResponse(score=score, user=UserDTO()).score == score
+
+
+def test_large_mixed_paper(make_paper):
+    paper = make_paper(problems=200, candidates=4, checked=False)
+    for p in paper.problems:
+        p.difficulty = random.choice(list(Difficulty))
+        if random.random() < 0.6:
+            p.get_answer_obj().checked = True
+
+    score = PaperView(encode_paper(paper)).calculate_score()
+    assert score == paper.calculate_score()
+    assert 0 <= score <= 100
+    assert PostSubmitResponse(score=score, user=UserDTO()).score == score